@@ -33,12 +33,13 @@ from PyQt6.QtWidgets import (
     QApplication,
     QMessageBox, )
 
+from src.data.app_info_store import AppInfoStore
 from src.data.config import CONFIG
 from src.events import ShowWindowEvent
 from src.global_mouse_filter import GlobalMouseFilter
 from src.gui.pie_window import PieWindow
 from src.helper.keyboard_listener import HotkeyListener
-from src.utils.file_handling_utils import get_resource_path
+from src.utils.resource_pack import ResourcePack
 from src.utils.taskbar_hide_utils import set_taskbar_opacity, show_taskbar
 
 
@@ -160,6 +161,12 @@ class SingleInstance:
         sys.exit(1)  # Ensure the program exits after showing the message
 
     def cleanup(self):
+        # Write pending app info cache changes
+        try:
+            AppInfoStore.flush_instance()
+        except Exception as e:
+            logger.error(f"Error flushing app info cache: {e}")
+
         # Stop hotkey listener if it exists
         if hasattr(self, 'hotkey_listener'):
             try:
@@ -219,8 +226,7 @@ if __name__ == "__main__":
         set_taskbar_opacity(CONFIG.TASKBAR_OPACITY)
 
         # Load the QSS template
-        with open(get_resource_path("assets/style.qss"), "r") as file:
-            qss_template = file.read()
+        qss_template = ResourcePack.get_instance().read_text("assets/style.qss")
 
         # inserting style attributes from the config.py file
         qss = (qss_template
@@ -238,6 +244,8 @@ if __name__ == "__main__":
         # Create and show the main main_window
         window = PieWindow()
         app.setProperty("main_window", window)
+        # Built-in assets read so far came from one pack file instead of one file each
+        logger.info(f"Startup assets: {ResourcePack.get_instance().stats()}")
 
         # Install the GlobalMouseFilter
         global_mouse_filter = GlobalMouseFilter(window)
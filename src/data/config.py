@@ -17,13 +17,34 @@ class BaseConfig:
     VERSION = "1.0.0"
     INTERNAL_PROGRAM_NAME: str = "MightyPie"
     INTERNAL_CACHE_FILENAME: str = "apps_info_cache.json"
+    INTERNAL_CACHE_DB_FILENAME: str = "apps_info_cache.sqlite3"
+    INTERNAL_CACHE_FLUSH_DELAY: int = 5000
+    INTERNAL_CACHE_MAX_ENTRIES: int = 300
+    INTERNAL_CACHE_MAX_AGE_DAYS: int = 90
+    INTERNAL_CACHE_MAINTENANCE_INTERVAL: int = 3600000
+    INTERNAL_ICON_ATLAS_FILENAME: str = "app_icons.atlas"
+    INTERNAL_ICON_SIZES: Tuple[int, ...] = (16, 24, 32, 48, 64)
+    INTERNAL_ICON_STAT_TTL: int = 60000
+    INTERNAL_PIXMAP_CACHE_BUDGET: int = 8 * 1024 * 1024
+    INTERNAL_ICON_SWEEP_DELAY: int = 10000
     INTERNAL_BUTTON_CONFIG_FILENAME: str = "button_config.json"
     INTERNAL_INDICATOR_SVG_PATH: str = "assets/graphic_elements/indicator.svg"
+    INTERNAL_RESOURCE_PACK_PATH: str = "assets/resources.pack"
 
     # Runtime configuration fields
     SHOW_SETTINGS_AT_STARTUP: bool = True
     INVIS_UI_ENABLED_BY_DEFAULT: bool = False
     REFRESH_INTERVAL: int = 3000
+    WINDOW_EVENTS_ENABLED: bool = True
+    INTERNAL_SAFETY_REFRESH_INTERVAL: int = 30000
+    INTERNAL_REFRESH_MIN_INTERVAL: int = 1000
+    INTERNAL_REFRESH_MAX_INTERVAL: int = 30000
+    INTERNAL_REFRESH_ACTIVITY_WINDOW: int = 10000
+    INTERNAL_WINDOW_FILTER_CLASS_NAMES: Tuple[str, ...] = ("Progman", "AutoHotkeyGUI", "RainmeterMeterWindow")
+    INTERNAL_WINDOW_FILTER_EXE_NAMES: Tuple[str, ...] = ()
+    INTERNAL_WINDOW_FILTER_TITLE_PATTERNS: Tuple[str, ...] = ()
+    INTERNAL_WINDOW_FILTER_ALT_TAB: bool = False
+    INTERNAL_WINDOW_FILTER_PROFILE: bool = False
     PIE_MENU_VIS_DELAY: int = 0
     TASKBAR_OPACITY: int = 255
     HOTKEY_PRIMARY: str = "Alt+F1"
@@ -69,6 +90,7 @@ class BaseConfig:
         "SHOW_SETTINGS_AT_STARTUP": "Show Settings at Startup",
         "INVIS_UI_ENABLED_BY_DEFAULT": "Enable Invisible UI by Default",
         "REFRESH_INTERVAL": "Refresh Interval (ms) for open windows",
+        "WINDOW_EVENTS_ENABLED": "Track open windows via system events",
         "PIE_MENU_VIS_DELAY": "Delay showing Pie Menu (ms)",
         "TASKBAR_OPACITY": "Taskbar Opacity (0-255)",
         "HOTKEY_PRIMARY": "Hotkey to open Primary Pie Menu",
@@ -0,0 +1,398 @@
+import hashlib
+import json
+import logging
+import os
+import struct
+import time
+from threading import Lock
+from typing import Dict, Optional, Tuple, List, NamedTuple, Iterable, Any, Mapping
+
+from src.data.config import CONFIG
+from src.utils.json_utils import JSONManager
+
+logger = logging.getLogger(__name__)
+
+# Icon paths of the form "atlas:<key>" refer to an entry of the shared atlas instead of a file
+ATLAS_PREFIX = "atlas:"
+
+_MAGIC = b"MPATLAS2"
+# magic, offset of the index, length of the index
+_HEADER = struct.Struct("<8sQQ")
+
+
+def atlas_icon_path(key: str) -> str:
+    return f"{ATLAS_PREFIX}{key}"
+
+
+def atlas_key(icon_path: str) -> Optional[str]:
+    """Return the atlas key of an "atlas:<key>" icon path, or None for a file path."""
+    return icon_path[len(ATLAS_PREFIX):] if icon_path and icon_path.startswith(ATLAS_PREFIX) else None
+
+
+class AtlasEntryStat(NamedTuple):
+    """The part of os.stat_result the IconPathValidator uses; st_mtime_ns changes whenever an icon is replaced."""
+    st_mtime_ns: int
+    st_size: int
+
+
+def png_size(data: bytes) -> int:
+    """Width of an encoded PNG, read from its IHDR chunk."""
+    return struct.unpack(">I", data[16:20])[0]
+
+
+def blob_key(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+class IconAtlas:
+    """
+    All app icons packed into one file, content-addressed and at several resolutions.
+
+    Each image (an encoded PNG) is stored once under the hash of its bytes, and an icon maps
+    its sizes to image hashes ({"16": hash, "32": hash, ...}), so apps that share an icon share
+    the images. get() picks the stored size that best fits the pixel size being drawn.
+
+    Layout: a header with the index position, the image blobs, then the index as JSON
+    ({"blobs": {hash: [offset, length]}, "icons": {key: {size: hash}}}). The file is read
+    once; afterwards icons are sliced from memory, so rendering a button never opens a file.
+
+    Writes append new blobs and a new index after everything else and only then point the
+    header at the new index, so a crash mid-write leaves the previous state readable.
+    Unreferenced blobs and old indexes are garbage until compact() rewrites the file.
+    """
+
+    _instance = None
+    _instance_lock = Lock()
+
+    def __init__(self, path: str, auto_compact_ratio: float = 0.5, auto_compact_min_bytes: int = 256 * 1024):
+        """
+        Args:
+            path: The atlas file, created if it does not exist.
+            auto_compact_ratio: Compact after a write once this fraction of the file is garbage.
+            auto_compact_min_bytes: Never auto-compact files smaller than this.
+        """
+        self.path = path
+        self.auto_compact_ratio = auto_compact_ratio
+        self.auto_compact_min_bytes = auto_compact_min_bytes
+        self._lock = Lock()
+
+        self._buffer = bytearray()
+        self._blobs: Dict[str, Tuple[int, int]] = {}
+        self._icons: Dict[str, Dict[int, str]] = {}
+        self._versions: Dict[str, int] = {}
+        self._index_length = 0
+
+        self.reads = 0
+        self.writes = 0
+        self.compactions = 0
+
+        with self._lock:
+            self._open()
+
+    @staticmethod
+    def get_instance() -> "IconAtlas":
+        if IconAtlas._instance is None:
+            with IconAtlas._instance_lock:
+                if IconAtlas._instance is None:
+                    cache_dir = JSONManager.get_config_directory(CONFIG.INTERNAL_PROGRAM_NAME, config_type='cache')
+                    IconAtlas._instance = IconAtlas(os.path.join(cache_dir, CONFIG.INTERNAL_ICON_ATLAS_FILENAME))
+        return IconAtlas._instance
+
+    # region Reads, served from memory
+    def get(self, key: str, pixel_size: Optional[int] = None) -> Optional[bytes]:
+        """Return the image that best fits pixel_size: the smallest one at least that large, else the largest.
+
+        Without a pixel_size the largest image is returned.
+        """
+        with self._lock:
+            sizes = self._icons.get(key)
+            if not sizes:
+                return None
+            size = self._best_size(sizes, pixel_size)
+            self.reads += 1
+            offset, length = self._blobs[sizes[size]]
+            return bytes(self._buffer[offset:offset + length])
+
+    def sizes(self, key: str) -> List[int]:
+        """The stored sizes of an icon, ascending."""
+        with self._lock:
+            return sorted(self._icons.get(key, {}))
+
+    def stat(self, key: str) -> Optional[AtlasEntryStat]:
+        with self._lock:
+            sizes = self._icons.get(key)
+            if sizes is None:
+                return None
+            return AtlasEntryStat(self._versions[key], sum(self._blobs[blob][1] for blob in sizes.values()))
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return list(self._icons)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._icons
+
+    def __len__(self) -> int:
+        return len(self._icons)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            live_bytes = self._live_bytes()
+            references = sum(len(sizes) for sizes in self._icons.values())
+            return {
+                "icons": len(self._icons),
+                "images": len(self._blobs),
+                "shared_images": references - len(self._blobs),
+                "file_bytes": len(self._buffer),
+                "garbage_bytes": len(self._buffer) - live_bytes,
+                "reads": self.reads,
+                "writes": self.writes,
+                "compactions": self.compactions,
+            }
+
+    # endregion
+
+    # region Writes
+    def set_icon(self, key: str, images: Mapping[int, bytes]) -> None:
+        """Add or overwrite an icon from {pixel size: encoded PNG}; images already stored are not written again."""
+        with self._lock:
+            if self._icons.get(key) == {size: blob_key(data) for size, data in images.items()}:
+                return
+            self._write({key: images}, ())
+
+    def add(self, key: str, data: bytes) -> bool:
+        """Add a single-size icon unless the key already exists. Returns whether it was added."""
+        with self._lock:
+            if key in self._icons:
+                return False
+            self._write({key: {png_size(data): data}}, ())
+            return True
+
+    def replace(self, key: str, data: bytes) -> None:
+        """Add or overwrite an icon with a single image."""
+        self.set_icon(key, {png_size(data): data})
+
+    def remove(self, keys: Iterable[str]) -> int:
+        """Remove icons and return how many existed; their bytes are reclaimed by the next compaction."""
+        with self._lock:
+            keys = [key for key in keys if key in self._icons]
+            if keys:
+                self._write({}, keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._icons.clear()
+            self._versions.clear()
+            self._rewrite()
+
+    def compact(self) -> int:
+        """Rewrite the file with only the referenced images. Returns the number of bytes reclaimed."""
+        with self._lock:
+            before = len(self._buffer)
+            self._rewrite()
+            self.compactions += 1
+            reclaimed = before - len(self._buffer)
+        logger.debug(f"Compacted icon atlas {self.path}, reclaimed {reclaimed} bytes.")
+        return reclaimed
+
+    # endregion
+
+    @staticmethod
+    def _best_size(sizes: Mapping[int, str], pixel_size: Optional[int]) -> int:
+        available = sorted(sizes)
+        if pixel_size is not None:
+            for size in available:
+                if size >= pixel_size:
+                    return size
+        return available[-1]
+
+    @staticmethod
+    def _version(sizes: Mapping[int, str]) -> int:
+        return int(blob_key("".join(f"{size}:{sizes[size]};" for size in sorted(sizes)).encode())[:15], 16)
+
+    def _live_bytes(self) -> int:
+        return _HEADER.size + sum(length for _, length in self._blobs.values()) + self._index_length
+
+    def _encode_index(self) -> bytes:
+        return json.dumps({
+            "blobs": {blob: list(entry) for blob, entry in self._blobs.items()},
+            "icons": {key: {str(size): blob for size, blob in sizes.items()} for key, sizes in self._icons.items()},
+        }, separators=(",", ":")).encode()
+
+    def _write(self, icons: Mapping[str, Mapping[int, bytes]], removed: Iterable[str]) -> None:
+        offset = len(self._buffer)
+        appended = bytearray()
+        for key, images in icons.items():
+            sizes = {}
+            for size, data in images.items():
+                blob = blob_key(data)
+                if blob not in self._blobs:
+                    self._blobs[blob] = (offset + len(appended), len(data))
+                    appended += data
+                sizes[size] = blob
+            self._icons[key] = sizes
+            self._versions[key] = self._version(sizes)
+        for key in removed:
+            self._icons.pop(key, None)
+            self._versions.pop(key, None)
+        self._drop_unreferenced_blobs()
+        index_offset = offset + len(appended)
+        index = self._encode_index()
+        appended += index
+
+        try:
+            with open(self.path, "r+b") as f:
+                f.seek(offset)
+                f.write(appended)
+                f.flush()
+                # Only now switch to the new index
+                f.seek(0)
+                f.write(_HEADER.pack(_MAGIC, index_offset, len(index)))
+        except OSError as e:
+            logger.error(f"Error writing icon atlas {self.path}: {e}")
+            self._open()
+            return
+
+        self._buffer += appended
+        self._buffer[0:_HEADER.size] = _HEADER.pack(_MAGIC, index_offset, len(index))
+        self._index_length = len(index)
+        self.writes += 1
+
+        if (len(self._buffer) >= self.auto_compact_min_bytes
+                and len(self._buffer) - self._live_bytes() > len(self._buffer) * self.auto_compact_ratio):
+            self._rewrite()
+            self.compactions += 1
+
+    def _drop_unreferenced_blobs(self) -> None:
+        referenced = {blob for sizes in self._icons.values() for blob in sizes.values()}
+        for blob in [blob for blob in self._blobs if blob not in referenced]:
+            del self._blobs[blob]
+
+    def _rewrite(self) -> None:
+        self._drop_unreferenced_blobs()
+        buffer = bytearray(_HEADER.size)
+        blobs: Dict[str, Tuple[int, int]] = {}
+        for blob, (offset, length) in self._blobs.items():
+            blobs[blob] = (len(buffer), length)
+            buffer += self._buffer[offset:offset + length]
+        self._blobs = blobs
+        index_offset = len(buffer)
+        encoded_index = self._encode_index()
+        buffer += encoded_index
+        buffer[0:_HEADER.size] = _HEADER.pack(_MAGIC, index_offset, len(encoded_index))
+
+        temp_path = f"{self.path}.tmp"
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(buffer)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.error(f"Error rewriting icon atlas {self.path}: {e}")
+        self._buffer = buffer
+        self._index_length = len(encoded_index)
+
+    def _open(self) -> None:
+        """Read the whole file once; a missing or unreadable atlas starts empty."""
+        self._blobs, self._icons, self._versions = {}, {}, {}
+        try:
+            with open(self.path, "rb") as f:
+                self._buffer = bytearray(f.read())
+            magic, index_offset, index_length = _HEADER.unpack_from(self._buffer)
+            if magic != _MAGIC:
+                raise ValueError("not an icon atlas")
+            index = json.loads(self._buffer[index_offset:index_offset + index_length])
+            self._blobs = {blob: (entry[0], entry[1]) for blob, entry in index["blobs"].items()}
+            self._icons = {key: {int(size): blob for size, blob in sizes.items()}
+                           for key, sizes in index["icons"].items()}
+            self._versions = {key: self._version(sizes) for key, sizes in self._icons.items()}
+            self._index_length = index_length
+            return
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, struct.error) as e:
+            logger.error(f"Icon atlas {self.path} is unreadable, starting a new one: {e}")
+        self._buffer = bytearray()
+        self._blobs, self._icons, self._versions = {}, {}, {}
+        self._rewrite()
+
+
+def run_benchmark(button_count: int = 48, distinct_icons: int = 16, sizes=(16, 24, 32, 48, 64), repeat: int = 20) -> None:
+    """
+    Compare populating a menu of button_count icons from one 32px PNG per file against the atlas, cold and warm.
+
+    The atlas stores every icon at all sizes; buttons share distinct_icons different images, like
+    explorer-hosted or Electron apps do.
+    """
+    import tempfile
+    import zlib
+
+    try:
+        from PyQt6.QtGui import QImage
+        decode = lambda data: QImage.fromData(data, "PNG")
+    except ImportError:
+        decode = None
+        print("PyQt6 is not available, measuring reads without decoding.")
+
+    def encode_png(seed: int, icon_size: int) -> bytes:
+        rows = b"".join(b"\x00" + bytes((seed + x + y) % 256 for x in range(icon_size * 4)) for y in range(icon_size))
+
+        def chunk(tag: bytes, data: bytes) -> bytes:
+            return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+        header = struct.pack(">IIBBBBB", icon_size, icon_size, 8, 6, 0, 0, 0)
+        return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(rows)) + chunk(b"IEND", b"")
+
+    icons = {f"app{i}": {size: encode_png(i % distinct_icons, size) for size in sizes} for i in range(button_count)}
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        paths = []
+        for key, images in icons.items():
+            path = os.path.join(temp_dir, f"{key}.png")
+            with open(path, "wb") as f:
+                f.write(images[32])
+            paths.append(path)
+        files_bytes = sum(os.path.getsize(path) for path in paths)
+        atlas_path = os.path.join(temp_dir, "app_icons.atlas")
+        atlas = IconAtlas(atlas_path)
+        for key, images in icons.items():
+            atlas.set_icon(key, images)
+        atlas.compact()
+        atlas_bytes = os.path.getsize(atlas_path)
+        atlas_stats = atlas.stats()
+
+        def populate_from_files() -> None:
+            for path in paths:
+                with open(path, "rb") as f:
+                    data = f.read()
+                if decode:
+                    decode(data)
+
+        def populate_from_atlas(source: IconAtlas, pixel_size: int) -> None:
+            for key in icons:
+                data = source.get(key, pixel_size)
+                if decode:
+                    decode(data)
+
+        def measure(func) -> float:
+            start = time.perf_counter()
+            for _ in range(repeat):
+                func()
+            return (time.perf_counter() - start) / repeat * 1000
+
+        # Cold: the atlas is opened (one file read) for every population; files are read one by one either way
+        files_ms = measure(populate_from_files)
+        atlas_cold_ms = measure(lambda: populate_from_atlas(IconAtlas(atlas_path), 32))
+        atlas_warm_ms = measure(lambda: populate_from_atlas(atlas, 32))
+
+    print(f"{button_count} buttons sharing {distinct_icons} icons; files: one 32px PNG each, "
+          f"atlas: sizes {', '.join(map(str, sizes))}")
+    print(f"{'per-file ms':>12} {'atlas cold ms':>14} {'atlas warm ms':>14} {'files KB':>9} {'atlas KB':>9} "
+          f"{'images':>7} {'shared':>7}")
+    print(f"{files_ms:>12.3f} {atlas_cold_ms:>14.3f} {atlas_warm_ms:>14.3f} {files_bytes / 1024:>9.1f} "
+          f"{atlas_bytes / 1024:>9.1f} {atlas_stats['images']:>7} {atlas_stats['shared_images']:>7}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -1,45 +1,51 @@
-from src.utils.file_handling_utils import get_resource_path
+from src.utils.resource_pack import ResourcePack
+
+
+def _external_icon(filename: str) -> str:
+    """Path of a built-in icon: served from the resource pack if it is packed, else the loose file."""
+    return ResourcePack.get_instance().path_for(f"assets/external_icons/{filename}")
+
 
 EXTERNAL_ICON_PATHS = {
-    "windows_key": get_resource_path("assets/external_icons/brand-windows.png"),
-    "audio": get_resource_path("assets/external_icons/volume.png"),
-    "network": get_resource_path("assets/external_icons/network.png"),
-    "action_center": get_resource_path("assets/external_icons/layout-sidebar-right-inactive.png"),
-    "projection": get_resource_path("assets/external_icons/device-desktop.png"),
-    "touch_keyboard": get_resource_path("assets/external_icons/keyboard.png"),
-    "folder": get_resource_path("assets/external_icons/folder.png"),
-    "folders": get_resource_path("assets/external_icons/folders.png"),
-    "folder-up": get_resource_path("assets/external_icons/folder-up.png"),
-    "folder-settings": get_resource_path("assets/external_icons/folder-settings.png"),
-    "folder-star": get_resource_path("assets/external_icons/folder-star.png"),
-    "folder-exclamation": get_resource_path("assets/external_icons/folder-exclamation.png"),
-    "taskman": get_resource_path("assets/external_icons/subtask.png"),
-    "browser_maximize": get_resource_path("assets/external_icons/browser-maximize.png"),
-    "square_x": get_resource_path("assets/external_icons/square-x.png"),
-    "window_maximize": get_resource_path("assets/external_icons/window-maximize.png"),
-    "window_minimize": get_resource_path("assets/external_icons/window-minimize.png"),
-    "quit": get_resource_path("assets/external_icons/playstation-x.png"),
-    "restart": get_resource_path("assets/external_icons/restore.png"),
-    "shredder": get_resource_path("assets/external_icons/file-shredder.png"),
-    "settings": get_resource_path("assets/external_icons/settings.png"),
-    "adjustments": get_resource_path("assets/external_icons/adjustments.png"),
-    "circles": get_resource_path("assets/external_icons/circles.png"),
-    "dots-circle": get_resource_path("assets/external_icons/dots-circle.png"),
-    "palette": get_resource_path("assets/external_icons/palette.png"),
-    "arrow-right": get_resource_path("assets/external_icons/arrow-right.png"),
-    "arrow-left": get_resource_path("assets/external_icons/arrow-left.png"),
-    "fullscreen": get_resource_path("assets/external_icons/fullscreen.png"),
-    "change": get_resource_path("assets/external_icons/change.png"),
-    "cake": get_resource_path("assets/external_icons/cake.png"),
-    "schedule-time": get_resource_path("assets/external_icons/schedule-time.png"),
-    "center": get_resource_path("assets/external_icons/center.png"),
-    "sort": get_resource_path("assets/external_icons/sort.png"),
-    "media-play": get_resource_path("assets/external_icons/play.png"),
-    "media-pause": get_resource_path("assets/external_icons/pause.png"),
-    "media-skip-forward": get_resource_path("assets/external_icons/skip-forward.png"),
-    "media-skip-backward": get_resource_path("assets/external_icons/skip-backward.png"),
-    "media-mute": get_resource_path("assets/external_icons/media-mute.png"),
-    "copy": get_resource_path("assets/external_icons/copy.png"),
-    "clipboard": get_resource_path("assets/external_icons/clipboard.png"),
-    "clipboard-search": get_resource_path("assets/external_icons/clipboard-search.png"),
+    "windows_key": _external_icon("brand-windows.png"),
+    "audio": _external_icon("volume.png"),
+    "network": _external_icon("network.png"),
+    "action_center": _external_icon("layout-sidebar-right-inactive.png"),
+    "projection": _external_icon("device-desktop.png"),
+    "touch_keyboard": _external_icon("keyboard.png"),
+    "folder": _external_icon("folder.png"),
+    "folders": _external_icon("folders.png"),
+    "folder-up": _external_icon("folder-up.png"),
+    "folder-settings": _external_icon("folder-settings.png"),
+    "folder-star": _external_icon("folder-star.png"),
+    "folder-exclamation": _external_icon("folder-exclamation.png"),
+    "taskman": _external_icon("subtask.png"),
+    "browser_maximize": _external_icon("browser-maximize.png"),
+    "square_x": _external_icon("square-x.png"),
+    "window_maximize": _external_icon("window-maximize.png"),
+    "window_minimize": _external_icon("window-minimize.png"),
+    "quit": _external_icon("playstation-x.png"),
+    "restart": _external_icon("restore.png"),
+    "shredder": _external_icon("file-shredder.png"),
+    "settings": _external_icon("settings.png"),
+    "adjustments": _external_icon("adjustments.png"),
+    "circles": _external_icon("circles.png"),
+    "dots-circle": _external_icon("dots-circle.png"),
+    "palette": _external_icon("palette.png"),
+    "arrow-right": _external_icon("arrow-right.png"),
+    "arrow-left": _external_icon("arrow-left.png"),
+    "fullscreen": _external_icon("fullscreen.png"),
+    "change": _external_icon("change.png"),
+    "cake": _external_icon("cake.png"),
+    "schedule-time": _external_icon("schedule-time.png"),
+    "center": _external_icon("center.png"),
+    "sort": _external_icon("sort.png"),
+    "media-play": _external_icon("play.png"),
+    "media-pause": _external_icon("pause.png"),
+    "media-skip-forward": _external_icon("skip-forward.png"),
+    "media-skip-backward": _external_icon("skip-backward.png"),
+    "media-mute": _external_icon("media-mute.png"),
+    "copy": _external_icon("copy.png"),
+    "clipboard": _external_icon("clipboard.png"),
+    "clipboard-search": _external_icon("clipboard-search.png"),
 }
@@ -0,0 +1,173 @@
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, Mapping, Sequence, Deque, List, Any
+
+from src.data.window_snapshot_store import WindowInfo
+
+logger = logging.getLogger(__name__)
+
+SLOT_ANY_WINDOW = "show_any_window"
+SLOT_PROGRAM_WINDOW = "show_program_window"
+
+# Assigned hwnd of a button that got no window, matching the button config conventions
+NO_WINDOW_ANY = -1
+NO_WINDOW_PROGRAM = 0
+
+
+@dataclass(frozen=True)
+class ButtonSlot:
+    """A button that windows are assigned to."""
+    button_id: int
+    kind: str  # SLOT_ANY_WINDOW or SLOT_PROGRAM_WINDOW
+    hwnd: int  # Window assigned in the previous run, or -1 / 0
+    exe_name: str = ""  # For SLOT_PROGRAM_WINDOW: the exe whose windows are reserved for the button
+    pinned: bool = False  # Keeps its window even when all buttons are reassigned
+
+
+class WindowAssignmentEngine:
+    """
+    Deterministic window-to-button assignment.
+
+    Windows are handed out in priority order:
+        1. Every button keeps its window if it is still open (program buttons only if it still
+           belongs to their exe). On reassign_all, only pinned buttons keep theirs.
+        2. Program buttons without a window get the most recently used free window of their exe.
+        3. Free "any window" buttons are filled lowest button ID first with the remaining
+           windows, most recently used first.
+    Windows the MRU order does not know yet come after it, ordered by hwnd, so the same input
+    always gives the same assignment. Ranking the windows once and indexing them by exe makes
+    a run O((B + W) log W) instead of a scan of all windows per button.
+    """
+
+    def __init__(self):
+        self.runs = 0
+        self.kept = 0
+        self.reserved = 0
+        self.filled = 0
+        self.unassigned = 0
+        self.last_ms = 0.0
+
+    def assign(self,
+               slots: Iterable[ButtonSlot],
+               windows: Mapping[int, WindowInfo],
+               recency: Sequence[int],
+               reassign_all: bool = False) -> Dict[int, int]:
+        """
+        Args:
+            slots: The buttons to assign windows to.
+            windows: The open windows, HWND -> (title, exe_name, instance).
+            recency: HWNDs from most to least recently used; may contain closed windows or miss new ones.
+            reassign_all: Drop the previous assignment of all buttons that are not pinned.
+
+        Returns:
+            Button ID -> assigned HWND, or NO_WINDOW_ANY / NO_WINDOW_PROGRAM.
+        """
+        start = time.perf_counter()
+        slots = sorted(slots, key=lambda slot: slot.button_id)
+
+        rank = {hwnd: i for i, hwnd in enumerate(hwnd for hwnd in recency if hwnd in windows)}
+        ordered = sorted(windows, key=lambda hwnd: (rank.get(hwnd, len(rank)), hwnd))
+        by_exe: Dict[str, Deque[int]] = {}
+        for hwnd in ordered:
+            by_exe.setdefault(windows[hwnd][1], deque()).append(hwnd)
+
+        result: Dict[int, int] = {}
+        taken = set()
+        kept = reserved = filled = 0
+
+        # 1. Keep existing slots
+        for slot in slots:
+            if reassign_all and not slot.pinned:
+                continue
+            info = windows.get(slot.hwnd)
+            if info is None or slot.hwnd in taken:
+                continue
+            if slot.kind == SLOT_PROGRAM_WINDOW and info[1] != slot.exe_name:
+                continue
+            result[slot.button_id] = slot.hwnd
+            taken.add(slot.hwnd)
+            kept += 1
+
+        # 2. Per-exe reservations of program buttons
+        for slot in slots:
+            if slot.kind != SLOT_PROGRAM_WINDOW or slot.button_id in result:
+                continue
+            candidates = by_exe.get(slot.exe_name)
+            while candidates and candidates[0] in taken:
+                candidates.popleft()
+            if candidates:
+                hwnd = candidates.popleft()
+                result[slot.button_id] = hwnd
+                taken.add(hwnd)
+                reserved += 1
+            else:
+                result[slot.button_id] = NO_WINDOW_PROGRAM
+
+        # 3. Fill the gaps with the remaining windows, most recently used first
+        free_windows = (hwnd for hwnd in ordered if hwnd not in taken)
+        for slot in slots:
+            if slot.kind != SLOT_ANY_WINDOW or slot.button_id in result:
+                continue
+            hwnd = next(free_windows, None)
+            if hwnd is None:
+                result[slot.button_id] = NO_WINDOW_ANY
+                continue
+            result[slot.button_id] = hwnd
+            taken.add(hwnd)
+            filled += 1
+
+        self.runs += 1
+        self.kept += kept
+        self.reserved += reserved
+        self.filled += filled
+        self.unassigned += len(slots) - kept - reserved - filled
+        self.last_ms = (time.perf_counter() - start) * 1000
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "runs": self.runs,
+            "kept": self.kept,
+            "reserved": self.reserved,
+            "filled": self.filled,
+            "unassigned": self.unassigned,
+            "last_ms": round(self.last_ms, 3),
+        }
+
+
+def _benchmark_input(num_buttons: int, num_windows: int, seed: int = 0):
+    rng = random.Random(seed)
+    exes = [f"app{i}.exe" for i in range(max(num_windows // 5, 1))]
+    windows = {0x10000 + i * 4: (f"Window {i}", rng.choice(exes), 0) for i in range(num_windows)}
+    hwnds = list(windows)
+    recency = rng.sample(hwnds, len(hwnds) * 3 // 4)  # Some windows are not in the MRU order yet
+    slots: List[ButtonSlot] = []
+    for button_id in range(num_buttons):
+        if button_id % 4 == 3:
+            slots.append(ButtonSlot(button_id, SLOT_PROGRAM_WINDOW, rng.choice(hwnds + [0]), rng.choice(exes)))
+        else:
+            slots.append(ButtonSlot(button_id, SLOT_ANY_WINDOW, rng.choice(hwnds + [-1]), pinned=button_id < 8))
+    return slots, windows, recency
+
+
+def run_benchmark(repeat: int = 20) -> None:
+    """Time one assignment run for 48 / 480 buttons and 100 / 1000 / 5000 windows."""
+    print(f"{'buttons':>8} {'windows':>8} {'ms/run':>8} {'reassign ms':>12}")
+    for num_buttons in (48, 480):
+        for num_windows in (100, 1000, 5000):
+            slots, windows, recency = _benchmark_input(num_buttons, num_windows)
+            engine = WindowAssignmentEngine()
+            timings = []
+            for reassign_all in (False, True):
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    engine.assign(slots, windows, recency, reassign_all)
+                timings.append((time.perf_counter() - start) / repeat * 1000)
+            print(f"{num_buttons:>8} {num_windows:>8} {timings[0]:>8.3f} {timings[1]:>12.3f}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -1,9 +1,12 @@
 import logging
-from copy import deepcopy
 from threading import Lock
-from typing import Dict, Tuple, Set, Any
+from typing import Dict, Tuple, Any, Optional, List, Mapping, Callable
 
+from src.data.app_info_store import AppInfoStore
 from src.data.config import CONFIG
+from src.data.window_assignment import WindowAssignmentEngine, ButtonSlot, SLOT_ANY_WINDOW, SLOT_PROGRAM_WINDOW
+from src.data.window_mru import WindowMRU
+from src.data.window_snapshot_store import WindowSnapshotStore, WindowDelta, WindowDiff, WindowSnapshot
 
 logger = logging.getLogger(__name__)
 
@@ -16,11 +19,26 @@ class WindowManager:
         if WindowManager._instance is not None:
             logger.warning("Attempted to directly instantiate the singleton instance of WindowManager. Use get_instance().")
             raise RuntimeError("Use get_instance() to access the Window Manager singleton instance.")
-        self._window_hwnd_mapping: Dict[int, Tuple[str, str, int]] = {}
-        self.last_window_handles = []
+        self._snapshot_store = WindowSnapshotStore()
+        # Swapped for a new immutable snapshot on every change; readers never copy or lock
+        self._snapshot: WindowSnapshot = self._snapshot_store.snapshot()
+        self._mru = WindowMRU()
+        self._assignment_engine = WindowAssignmentEngine()
+        self._assigned_generation = -1
+        self.last_diff: WindowDiff = WindowDiff()
         self.windowHandles_To_buttonIndexes_map = {}
-        self._app_info_cache: Dict[str, Dict[str, str]] = {}
-        self.windows_info: Dict[int, Tuple[str, str, int]] = {}
+        self._app_info_store: Optional[AppInfoStore] = None
+        self._icon_path_validator: Optional[Callable[[str, str], str]] = None
+        # Snapshot taken at the start of each assignment, so one run sees a consistent cache
+        self._app_info_cache: Mapping[str, Mapping[str, str]] = {}
+        self.windows_info: Mapping[int, Tuple[str, str, int]] = {}
+        # What the pie menus currently show, so only changed buttons are emitted
+        self._emitted_buttons: Dict[int, Dict[str, Any]] = {}
+        self._emit_lock = Lock()
+        self.button_updates_emitted = 0
+        self.button_updates_skipped = 0
+        self.buttons_emitted = 0
+        self.last_buttons_emitted = 0
 
     @staticmethod
     def get_instance() -> "WindowManager":
@@ -30,44 +48,30 @@ class WindowManager:
                     WindowManager._instance = WindowManager()
         return WindowManager._instance
 
-    def set_app_info_cache(self, cache: Dict[str, Dict[str, str]]) -> None:
-        """Updates the application info cache."""
-        with self._lock:
-            self._app_info_cache = deepcopy(cache)
+    def set_app_info_store(self, store: AppInfoStore) -> None:
+        """Keep a reference to the app info cache; assignments read it through snapshots."""
+        self._app_info_store = store
 
-    def update_open_windows_info(self, new_map: Dict[int, Tuple[str, str, int]]) -> None:
+    def set_icon_path_validator(self, validator: Optional[Callable[[str, str], str]]) -> None:
+        """Set a function (exe_name, icon_path) -> usable icon path, applied when an icon is put on a button."""
+        self._icon_path_validator = validator
+
+    def apply_window_scan(self, scanned: Dict[int, Tuple[str, str]]) -> WindowDiff:
         """
-        Atomically update the mapping with the new data.
-        Replaces the current mapping to ensure consistency for readers.
-        
-        This is the window info, where:
-        - The key is the HWND (int).
-        - The values are a tuple containing:
-            1. Window title (str): The title of the window.
-            2. Exe Name (str): The human-friendly name of the executable.
-            3. Instance number (int): A unique instance number for this window.
+        Reconcile a full window enumeration with the snapshot store.
 
         Args:
-            new_map: A dictionary mapping HWNDs to their corresponding window info.
+            scanned: A dictionary mapping HWNDs to (window title, exe name).
 
-        Raises:
-            ValueError: If any value in the new_map is not a tuple of (str, str, int).
+        Returns:
+            The diff against the previous state; empty if nothing changed.
         """
-        with self._lock:
-            # Validate the input to ensure all values are tuples of the correct form
-            for key, value in new_map.items():
-                if not (isinstance(value, tuple) and len(value) == 3 and
-                        isinstance(value[0], str) and isinstance(value[1], str) and isinstance(value[2], int)):
-                    logger.error(f"Invalid window info for key {key}: {value}")
-                    raise ValueError("Each value in the dictionary must be a tuple of (str, str, int).")
-
-            # Atomically replace the entire dictionary
-            self._window_hwnd_mapping = new_map.copy()
-
-    def get_open_windows_info(self) -> Dict[int, Tuple[str, str, int]]:
+        return self._publish(self._snapshot_store.apply_scan(scanned))
+
+    def get_open_windows_info(self) -> Mapping[int, Tuple[str, str, int]]:
         """
-        Return a copy of the current mapping.
-        Ensures readers always get a consistent and stable view of the data.
+        Return the current mapping, read-only.
+        It belongs to an immutable snapshot, so readers always get a consistent and stable view without a copy.
 
         This is the window info, where:
         - The key is the HWND (int).
@@ -77,125 +81,126 @@ class WindowManager:
             3. Instance number (int): A unique instance number for this window.
 
         Returns:
-            A copy of the HWND mapping dictionary.
+            A read-only HWND mapping.
+        """
+        return self._snapshot.windows
+
+    def get_snapshot(self) -> WindowSnapshot:
+        """Return an immutable, generation-stamped view of the open windows."""
+        return self._snapshot
+
+    def get_window_info(self, hwnd: int) -> Optional[Tuple[str, str, int]]:
+        """Return the (title, exe_name, instance) of a single window, or None if it is not open."""
+        return self._snapshot.windows.get(hwnd)
+
+    def is_window_open(self, hwnd: int) -> bool:
+        """O(1) check whether the window is among the open (valid) windows."""
+        return hwnd in self._snapshot
+
+    def apply_window_delta(self, delta: WindowDelta) -> WindowDiff:
+        """Apply an incremental change (e.g. from window events) and return the resulting diff."""
+        return self._publish(self._snapshot_store.apply_delta(delta))
+
+    def activate_window(self, hwnd: int) -> None:
+        """Mark a window as most recently used, e.g. when it became the foreground window."""
+        self._mru.activate(hwnd)
+
+    def get_windows_by_recency(self) -> List[int]:
+        """Return the HWNDs of the open windows, most recently used first."""
+        return self._mru.ordered()
+
+    def _publish(self, diff: WindowDiff) -> WindowDiff:
+        """Atomically swap in the snapshot readers see; it is only rebuilt if something changed."""
+        # Also after an empty diff, which refreshes the snapshot's timestamp
+        self._snapshot = self._snapshot_store.snapshot()
+        if not diff.is_empty():
+            self._mru.remove(diff.removed)
+            self._mru.add(diff.added)
+            logger.debug(f"Window diff #{diff.generation}: {len(diff.added)} added, {len(diff.removed)} removed, "
+                         f"{len(diff.retitled)} retitled, {diff.unchanged} unchanged.")
+        self.last_diff = diff
+        return diff
+
+    def update_button_window_assignment(self, pie_window, button_info, reassign_all_buttons: bool = True,
+                                        skip_if_unchanged: bool = False) -> None:
+        """Updates button info with current window information.
+
+        With skip_if_unchanged, nothing is assigned or emitted if the windows did not change since the last run.
         """
-        return self._window_hwnd_mapping.copy()
+        generation = self._snapshot_store.generation
+        if skip_if_unchanged and not reassign_all_buttons and generation == self._assigned_generation:
+            logger.debug("Windows unchanged since last assignment, skipping.")
+            return
+        self._assigned_generation = generation
 
-    def update_button_window_assignment(self, pie_window, button_info, reassign_all_buttons: bool = True) -> None:
-        """Updates button info with current window information."""
+        if self._app_info_store is not None:
+            self._app_info_cache = self._app_info_store.snapshot().apps
 
-        # Create working copy of button configurations
-        updated_button_config: Dict[int, Dict[str, Any]] = deepcopy(button_info.get_all_tasks())
+        # Working copy of the button configurations; properties are flat, so copying them is enough
+        updated_button_config: Dict[int, Dict[str, Any]] = {
+            button_id: {**button, 'properties': dict(button['properties'])}
+            for button_id, button in button_info.get_all_tasks().items()
+        }
 
         # Get current windows info
         self.windows_info = self.get_open_windows_info()
 
-        # Track processed buttons
-        processed_buttons: Set[int] = set()
-
-        # Get filtered button sets by type
-        show_program_window_buttons = button_info.filter_buttons("task_type", "show_program_window")
-        show_any_window_buttons = button_info.filter_buttons("task_type", "show_any_window")
-        launch_program_buttons = button_info.filter_buttons("task_type", "launch_program")
-
-        # Process Launch Program Buttons
-        self._update_launch_program_windows(launch_program_buttons)
-
-        # Process Show (specific) Program Buttons
-        self._update_existing_handles(show_program_window_buttons, processed_buttons, reassign_all_buttons, True)
-        self._assign_free_windows_for_show_program_window_buttons(show_program_window_buttons, processed_buttons)
-
-        # Process Show Any Window Buttons
-        self._update_existing_handles(show_any_window_buttons, processed_buttons, reassign_all_buttons)
-        self._assign_free_windows_for_show_any_window_buttons(show_any_window_buttons, processed_buttons)
+        slots: List[ButtonSlot] = []
+        for button_id, button in updated_button_config.items():
+            task_type = button['task_type']
+            properties = button['properties']
+            if task_type == "launch_program":
+                self._update_button_with_window_info(button, "", properties['exe_name'], 0, True)
+            elif task_type == SLOT_PROGRAM_WINDOW and properties['exe_name'] not in self._app_info_cache:
+                properties.update({
+                    'window_handle': -1,
+                    'app_name': properties['exe_name'].rstrip(".exe").capitalize()
+                })
+            elif task_type in (SLOT_PROGRAM_WINDOW, SLOT_ANY_WINDOW):
+                slots.append(ButtonSlot(button_id, task_type, properties['window_handle'],
+                                        properties.get('exe_name', ''),
+                                        pinned=button_id <= CONFIG.REASSIGN_BTN_IDS_HIGHER_THAN))
 
-        # Update final configuration
-        updated_button_config.update(show_any_window_buttons)
-        updated_button_config.update(show_program_window_buttons)
-        updated_button_config.update(launch_program_buttons)
+        assignment = self._assignment_engine.assign(slots, self.windows_info, self._mru.ordered(), reassign_all_buttons)
+        for slot in slots:
+            self._apply_assignment(updated_button_config[slot.button_id], slot, assignment[slot.button_id])
 
         logger.debug("Button window assignments updated successfully.")
 
-        self._emit_button_updates(updated_button_config, pie_window)
-
-    def _update_launch_program_windows(self, buttons: Dict[int, Dict[str, Any]]) -> None:
-        for _, button in buttons.items():
-            exe_name = button['properties']['exe_name']
-            self._update_button_with_window_info(button, "", exe_name, 0, True)
-
-    def _update_existing_handles(
-            self,
-            buttons: Dict[int, Dict[str, Any]],
-            processed_buttons: Set[int] = None,
-            reassign_all: bool = False,
-            is_show_program_button: bool = False
-
-    ) -> None:
-        """Checks buttons with existing window handles and clears invalid ones."""
-        for button_id, button in buttons.items():
-            hwnd: int = button['properties']['window_handle']
-            if (hwnd in self.windows_info and
-                    # if reassign_all, only do it for certain IDs
-                    not (reassign_all and button_id > CONFIG.REASSIGN_BTN_IDS_HIGHER_THAN)):
-                title, exe_name, instance = self.windows_info[hwnd]
-                self.windows_info.pop(hwnd)
-                self._update_button_with_window_info(button, title, exe_name, instance, True)
-                processed_buttons.add(button_id)
-            else:
-                if not is_show_program_button:
-                    self._clear_button_properties(button)
-
-    def _assign_free_windows_for_show_program_window_buttons(
-            self,
-            buttons: Dict[int, Dict[str, Any]],
-            processed_buttons: Set[int]
-    ) -> None:
-        """Maps program-specific windows to their designated buttons."""
-        for button_id, button in buttons.items():
-            if button_id in processed_buttons:
-                continue
-
-            exe_name = button['properties']['exe_name']
-            if exe_name not in self._app_info_cache:
-                button['properties'].update({
-                    'window_handle': -1,
-                    'app_name': exe_name.rstrip(".exe").capitalize()
-                })
-                continue
-
-            matching_window = None
-            for hwnd, (window_title, exe_name_from_window, instance_id) in self.windows_info.items():
-                if exe_name_from_window == exe_name:
-                    self.windows_info.pop(hwnd)
-                    matching_window = (hwnd, window_title, exe_name_from_window, instance_id)
-                    processed_buttons.add(button_id)
-                    break
-
-            if matching_window:
-                hwnd, title, _, instance = matching_window
-                button['properties']['window_handle'] = hwnd
-                self._update_button_with_window_info(
-                    button, title, exe_name, instance, True)
-            else:
-                button['properties']['window_handle'] = 0
-                self._update_button_with_window_info(
-                    button, "", exe_name, 0, True)
-
-    def _assign_free_windows_for_show_any_window_buttons(
-            self,
-            buttons: Dict[int, Dict[str, Any]],
-            processed_buttons: Set[int]
-    ) -> None:
-        """Assigns remaining windows to buttons that have no window handle."""
-        for button_id, button in buttons.items():
-            if button_id in processed_buttons:
-                continue
-
-            if button['properties']['window_handle'] == -1 and self.windows_info:
-                hwnd, (title, exe_name, instance) = self.windows_info.popitem()
-                button['properties']['window_handle'] = hwnd
-                self._update_button_with_window_info(button, title, exe_name, instance)
-                processed_buttons.add(button_id)
+        self._emit_button_updates(self._changed_buttons(updated_button_config), pie_window)
+
+    def _changed_buttons(self, updated_config: Dict[int, Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+        """Return the buttons whose type or properties (title, app name, icon, hwnd, ...) differ from the last emit."""
+        with self._emit_lock:
+            changed = {button_id: button for button_id, button in updated_config.items()
+                       if self._emitted_buttons.get(button_id) != button}
+            self._emitted_buttons.update({button_id: {**button, 'properties': dict(button['properties'])}
+                                          for button_id, button in changed.items()})
+        return changed
+
+    def button_update_stats(self) -> Dict[str, Any]:
+        return {
+            "emitted": self.button_updates_emitted,
+            "skipped": self.button_updates_skipped,
+            "buttons_emitted": self.buttons_emitted,
+            "last_buttons_emitted": self.last_buttons_emitted,
+            "mean_buttons_emitted": round(self.buttons_emitted / self.button_updates_emitted, 1)
+            if self.button_updates_emitted else None,
+        }
+
+    def _apply_assignment(self, button: Dict[str, Any], slot: ButtonSlot, hwnd: int) -> None:
+        """Write the assigned window, or the lack of one, into the button's properties."""
+        if hwnd in self.windows_info:
+            title, exe_name, instance = self.windows_info[hwnd]
+            button['properties']['window_handle'] = hwnd
+            # Buttons that kept their window or show a program also refresh the exe path
+            self._update_button_with_window_info(button, title, exe_name, instance,
+                                                 slot.kind == SLOT_PROGRAM_WINDOW or hwnd == slot.hwnd)
+        elif slot.kind == SLOT_PROGRAM_WINDOW:
+            button['properties']['window_handle'] = hwnd
+            self._update_button_with_window_info(button, "", slot.exe_name, 0, True)
+        else:
+            self._clear_button_properties(button)
 
     def _update_button_with_window_info(self,
                                         button: Dict[str, Any],
@@ -205,10 +210,15 @@ class WindowManager:
                                         include_exe_path: bool = False
                                         ) -> None:
         """Updates button properties with window information and app cache data."""
+        icon_path = self._app_info_cache.get(exe_name, {}).get('icon_path', '')
+        if self._icon_path_validator is not None and exe_name in self._app_info_cache:
+            # Icons are only checked when they are about to be shown
+            icon_path = self._icon_path_validator(exe_name, icon_path)
         button['properties'].update({
+            'exe_name': exe_name,
             'window_title': f"{title} ({instance})" if instance != 0 else title,
             'app_name': self._app_info_cache.get(exe_name, {}).get('app_name', ''),
-            'app_icon_path': self._app_info_cache.get(exe_name, {}).get('icon_path', ''),
+            'app_icon_path': icon_path,
             **({'exe_path': self._app_info_cache.get(exe_name, {}).get('exe_path', '')} if include_exe_path else {})
         })
 
@@ -220,10 +230,18 @@ class WindowManager:
             'window_title': '',
             'app_name': '',
             'app_icon_path': '',
+            'exe_name': '',
         })
 
-    @staticmethod
-    def _emit_button_updates(updated_config: Dict[int, Dict[str, Any]], pie_window) -> None:
+    def _emit_button_updates(self, changed_buttons: Dict[int, Dict[str, Any]], pie_window) -> None:
+        """Emit only the changed buttons; nothing is emitted if no button changed."""
+        if not changed_buttons:
+            self.button_updates_skipped += 1
+            logger.debug("No button changed, nothing to emit.")
+            return
+        self.button_updates_emitted += 1
+        self.buttons_emitted += len(changed_buttons)
+        self.last_buttons_emitted = len(changed_buttons)
         if pie_window:
-            pie_window.update_buttons_signal.emit(updated_config)
-        logger.info("Emitted button updates to pie window.")
+            pie_window.update_buttons_signal.emit(changed_buttons)
+        logger.info(f"Emitted {len(changed_buttons)} changed buttons to pie window. {self.button_update_stats()}")
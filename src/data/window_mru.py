@@ -0,0 +1,56 @@
+import logging
+from collections import OrderedDict
+from threading import Lock
+from typing import Iterable, List
+
+logger = logging.getLogger(__name__)
+
+
+class WindowMRU:
+    """
+    Most-recently-used order of the open windows, most recent first.
+
+    Backed by an OrderedDict, so activating, adding and removing a window are all O(1)
+    and the order is maintained incrementally instead of being sorted on each refresh.
+    """
+
+    def __init__(self):
+        self._order: "OrderedDict[int, None]" = OrderedDict()
+        self._lock = Lock()
+        self.activations = 0
+
+    def add(self, hwnds: Iterable[int]) -> None:
+        """Append newly seen windows as least recent, keeping the given order (EnumWindows yields z-order)."""
+        with self._lock:
+            for hwnd in hwnds:
+                if hwnd not in self._order:
+                    self._order[hwnd] = None
+
+    def remove(self, hwnds: Iterable[int]) -> None:
+        with self._lock:
+            for hwnd in hwnds:
+                self._order.pop(hwnd, None)
+
+    def activate(self, hwnd: int) -> bool:
+        """Move a known window to the front, e.g. when it became the foreground window."""
+        with self._lock:
+            if hwnd not in self._order:
+                return False
+            self._order.move_to_end(hwnd, last=False)
+            self.activations += 1
+            return True
+
+    def ordered(self) -> List[int]:
+        """Return the HWNDs from most to least recently used."""
+        with self._lock:
+            return list(self._order)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._order.clear()
+
+    def __contains__(self, hwnd: int) -> bool:
+        return hwnd in self._order
+
+    def __len__(self) -> int:
+        return len(self._order)
@@ -0,0 +1,194 @@
+import heapq
+import logging
+import time
+from dataclasses import dataclass, field, replace
+from threading import Lock
+from types import MappingProxyType
+from typing import Dict, Tuple, Set, List, TypeAlias, Mapping, Optional, FrozenSet
+
+logger = logging.getLogger(__name__)
+
+WindowInfo: TypeAlias = Tuple[str, str, int]  # (title, exe_name, instance)
+WindowEntry: TypeAlias = Tuple[str, str]  # (title, exe_name)
+
+
+@dataclass
+class WindowDelta:
+    """Incremental change to the open windows: added and retitled map HWND -> (title, exe_name)."""
+    added: Dict[int, WindowEntry] = field(default_factory=dict)
+    removed: Set[int] = field(default_factory=set)
+    retitled: Dict[int, WindowEntry] = field(default_factory=dict)
+
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.retitled)
+
+
+@dataclass
+class WindowDiff:
+    """Result of applying a scan or delta to the store, with instance numbers resolved."""
+    added: Dict[int, WindowInfo] = field(default_factory=dict)
+    removed: Dict[int, WindowInfo] = field(default_factory=dict)
+    retitled: Dict[int, WindowInfo] = field(default_factory=dict)
+    unchanged: int = 0
+    generation: int = 0
+
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.retitled)
+
+
+@dataclass(frozen=True)
+class WindowSnapshot:
+    """Read-only view of the open windows at one store generation, safe to hand to other threads.
+
+    Readers use it as is: nothing in it is ever mutated, a change produces a new snapshot.
+    """
+    generation: int
+    windows: Mapping[int, WindowInfo]
+    taken_at: float  # time.monotonic() of the scan or event that produced it
+    hwnds: FrozenSet[int] = frozenset()
+
+    def __contains__(self, hwnd: int) -> bool:
+        return hwnd in self.hwnds
+
+    def __len__(self) -> int:
+        return len(self.hwnds)
+
+    def age(self) -> float:
+        return time.monotonic() - self.taken_at
+
+
+class InstanceAllocator:
+    """Hands out the lowest free instance number for one (title, exe_name) pair."""
+
+    def __init__(self):
+        self._released: List[int] = []  # min-heap of numbers below _next that are free again
+        self._next = 0
+        self.in_use = 0
+
+    def allocate(self) -> int:
+        self.in_use += 1
+        if self._released:
+            return heapq.heappop(self._released)
+        instance = self._next
+        self._next += 1
+        return instance
+
+    def release(self, instance: int) -> None:
+        self.in_use -= 1
+        heapq.heappush(self._released, instance)
+
+
+class WindowSnapshotStore:
+    """
+    Keeps the open windows across refreshes and turns each scan into an explicit diff.
+
+    Instance numbers are allocated per (title, exe_name) and kept for as long as a window
+    keeps its title, so only added, removed and retitled windows cost any work.
+    """
+
+    def __init__(self):
+        self._records: Dict[int, WindowInfo] = {}
+        self._allocators: Dict[WindowEntry, InstanceAllocator] = {}
+        self._lock = Lock()
+        self.generation = 0
+        self._snapshot: Optional[WindowSnapshot] = None
+        self._updated_at = time.monotonic()
+
+    def get_records(self) -> Dict[int, WindowInfo]:
+        """Return a copy of the current HWND -> (title, exe_name, instance) records."""
+        with self._lock:
+            return self._records.copy()
+
+    def snapshot(self) -> WindowSnapshot:
+        """Return an immutable snapshot; it is only rebuilt when the generation changed."""
+        with self._lock:
+            if self._snapshot is None or self._snapshot.generation != self.generation:
+                records = self._records.copy()
+                self._snapshot = WindowSnapshot(self.generation, MappingProxyType(records), self._updated_at,
+                                                frozenset(records))
+            elif self._snapshot.taken_at != self._updated_at:
+                # Confirmed by a newer scan without changes: same windows, fresher timestamp
+                self._snapshot = replace(self._snapshot, taken_at=self._updated_at)
+            return self._snapshot
+
+    def get(self, hwnd: int):
+        return self._records.get(hwnd)
+
+    def apply_scan(self, scanned: Dict[int, WindowEntry]) -> WindowDiff:
+        """Reconcile a full enumeration result (HWND -> (title, exe_name)) with the stored records."""
+        with self._lock:
+            delta = WindowDelta(removed=self._records.keys() - scanned.keys())
+            unchanged = 0
+            for hwnd, entry in scanned.items():
+                record = self._records.get(hwnd)
+                if record is None:
+                    delta.added[hwnd] = entry
+                elif record[0] != entry[0] or record[1] != entry[1]:
+                    delta.retitled[hwnd] = entry
+                else:
+                    unchanged += 1
+            diff = self._apply(delta)
+            diff.unchanged = unchanged
+            return diff
+
+    def apply_delta(self, delta: WindowDelta) -> WindowDiff:
+        """Apply an incremental change, e.g. from window events."""
+        with self._lock:
+            diff = self._apply(delta)
+            diff.unchanged = len(self._records) - len(diff.added) - len(diff.retitled)
+            return diff
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+            self._allocators.clear()
+            self.generation += 1
+
+    def _apply(self, delta: WindowDelta) -> WindowDiff:
+        diff = WindowDiff()
+
+        # Release first, so freed instance numbers can be reused right away
+        for hwnd in delta.removed:
+            record = self._records.pop(hwnd, None)
+            if record is not None:
+                self._release(record)
+                diff.removed[hwnd] = record
+
+        for hwnd, (title, exe_name) in delta.retitled.items():
+            record = self._records.get(hwnd)
+            if record is None:
+                diff.added[hwnd] = self._insert(hwnd, title, exe_name)
+            elif (record[0], record[1]) != (title, exe_name):
+                self._release(record)
+                diff.retitled[hwnd] = self._insert(hwnd, title, exe_name)
+
+        for hwnd, (title, exe_name) in delta.added.items():
+            record = self._records.get(hwnd)
+            if record is None:
+                diff.added[hwnd] = self._insert(hwnd, title, exe_name)
+            elif (record[0], record[1]) != (title, exe_name):
+                self._release(record)
+                diff.retitled[hwnd] = self._insert(hwnd, title, exe_name)
+
+        self._updated_at = time.monotonic()
+        if not diff.is_empty():
+            self.generation += 1
+        diff.generation = self.generation
+        return diff
+
+    def _insert(self, hwnd: int, title: str, exe_name: str) -> WindowInfo:
+        allocator = self._allocators.get((title, exe_name))
+        if allocator is None:
+            allocator = self._allocators[(title, exe_name)] = InstanceAllocator()
+        record = (title, exe_name, allocator.allocate())
+        self._records[hwnd] = record
+        return record
+
+    def _release(self, record: WindowInfo) -> None:
+        title, exe_name, instance = record
+        allocator = self._allocators.get((title, exe_name))
+        if allocator is None:
+            return
+        allocator.release(instance)
+        if allocator.in_use == 0:
+            del self._allocators[(title, exe_name)]
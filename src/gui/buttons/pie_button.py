@@ -2,15 +2,16 @@ import logging
 from typing import *
 
 from PyQt6.QtCore import Qt, QTimer
-from PyQt6.QtGui import QPixmap, QCursor
+from PyQt6.QtGui import QCursor
 from PyQt6.QtWidgets import QVBoxLayout, QPushButton, QHBoxLayout, QLabel, QSpacerItem, QSizePolicy, QGraphicsOpacityEffect
 
 from src.data.button_functions import ButtonFunctions
 from src.data.config import CONFIG
 from src.data.font_styles import FontStyle
+from src.data.icon_paths import EXTERNAL_ICON_PATHS
 from src.gui.elements.scrolling_text_label import ScrollingLabel
 from src.utils.functions_utils import close_window_by_handle, launch_app, focus_window_by_handle
-from src.utils.icon_utils import invert_icon
+from src.utils.icon_utils import get_pixmap, TRANSFORM_INVERTED
 from src.utils.program_utils import main_window_hide, main_window_force_refresh
 
 logger = logging.getLogger(__name__)
@@ -22,6 +23,9 @@ NO_HWND_ASSIGNED = -1
 PROGRAM_NOT_YET_REGISTERED = -1
 READY_TO_OPEN_PROGRAM = 0
 
+# Shown while the icon of a newly seen app is still being extracted
+ICON_PLACEHOLDER = EXTERNAL_ICON_PATHS["dots-circle"]
+
 
 class PieButton(QPushButton):
     """Custom Button with text animation for long text."""
@@ -45,6 +49,7 @@ class PieButton(QPushButton):
         self.text_2: str = text_2
         self.icon_path: str = icon_path
         self.windowHandle: int = -1
+        self.exe_name: str = ""  # The app of the assigned window, to apply its icon once extracted
 
         self.button_type = "normal_pie_button"
 
@@ -112,7 +117,8 @@ class PieButton(QPushButton):
             return
 
         # Update button text and icon
-        self._update_ui(button_text_1, button_text_2, app_icon_path)
+        self.exe_name = properties["exe_name"]
+        self._update_ui(button_text_1, button_text_2, *self._icon_or_placeholder(app_icon_path))
 
         # check if there's anything to update
         if self.windowHandle == window_handle:
@@ -140,9 +146,21 @@ class PieButton(QPushButton):
         self.set_left_click_action(action=None)
         self.set_middle_click_action(action=None)
         self.setEnabled(False)  # Disable the button
+        self.exe_name = ""
 
         self._update_ui("Empty", "", "")
 
+    def set_ready_icon(self, exe_name: str, icon_path: str) -> None:
+        """Replace the placeholder once the icon of the assigned app was extracted."""
+        if self.exe_name == exe_name and self.icon_path == ICON_PLACEHOLDER:
+            self._update_ui(self.text_1, self.text_2, icon_path)
+
+    def _icon_or_placeholder(self, app_icon_path: str) -> Tuple[str, bool]:
+        """Return (icon path, invert) for a window button, using the placeholder while the icon is missing."""
+        if not app_icon_path and self.exe_name:
+            return ICON_PLACEHOLDER, True
+        return app_icon_path, False
+
     def _update_ui(self, text_1: str, text_2: str, app_icon_path=None, is_invert_icon=False) -> None:
         # Update label 1 text if it's different
         if self.text_1 != text_1:
@@ -218,23 +236,13 @@ class PieButton(QPushButton):
             spacer = QSpacerItem(CONFIG.INTERNAL_PIE_TEXT_LABEL_MARGINS, 0, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding)
             self.layout().insertItem(0, spacer)
 
-            # Load the icon from the file path
-            icon = QPixmap(app_icon_path)
+            # Scaled to 16x16 logical pixels for this screen, and inverted if requested, once per icon
+            icon = get_pixmap(app_icon_path, size=(16, 16), device_pixel_ratio=self.devicePixelRatioF(),
+                              transform=TRANSFORM_INVERTED if is_invert_icon else "")
 
             # Check if the icon is valid
             if not icon.isNull():
-                # Optionally invert the icon
-                if is_invert_icon:
-                    icon = invert_icon(icon, return_pixmap=True)
-
                 icon_label = QLabel()
-                # Determine scale factor dynamically
-                logical_size = 16  # Default logical size (adjust based on use case)
-                actual_size = icon.width()  # Use the actual image width
-
-                scale_factor = actual_size / logical_size  # Compute scale factor
-                icon.setDevicePixelRatio(scale_factor)  # Apply dynamic scaling
-
                 icon_label.setPixmap(icon)
 
                 # Keep logical size at 16x16, but allow Qt to scale it for high-DPI screens
@@ -338,11 +346,13 @@ class ShowProgramWindowPieButton(PieButton):
                     )
                 )
             button_text_1 = ""
+            self.exe_name = ""
             self._update_ui(button_text_1, button_text_2, app_icon_path)
             return
 
         # Update button text and icon
-        self._update_ui(button_text_1, button_text_2, app_icon_path)
+        self.exe_name = properties["exe_name"]
+        self._update_ui(button_text_1, button_text_2, *self._icon_or_placeholder(app_icon_path))
 
         # check if there's anything to update
         if self.windowHandle == window_handle:
@@ -370,6 +380,7 @@ class ShowProgramWindowPieButton(PieButton):
         self.set_left_click_action(action=None)
         self.set_middle_click_action(action=None)
         self.setEnabled(False)  # Disable the button
+        self.exe_name = ""
 
         self._update_ui("Not launched yet.", button_text_2, "")
 
@@ -1,13 +1,12 @@
 # gui/menus/button_info_dropdowns.py
 import logging
-from typing import Dict, List, Tuple, TYPE_CHECKING
+from typing import Dict, List, Tuple, Mapping, TYPE_CHECKING
 
 from PyQt6.QtWidgets import QComboBox
 
+from src.data.app_info_store import AppInfoStore
 from src.data.button_functions import ButtonFunctions
-from src.data.config import CONFIG
 from src.gui.buttons.pie_button import BUTTON_TYPES
-from src.utils.json_utils import JSONManager
 
 logger = logging.getLogger(__name__)
 
@@ -23,11 +22,10 @@ class ButtonDropdowns:
         self.exe_names = self._get_sorted_exe_names()
 
     @staticmethod
-    def _load_apps_info() -> Dict:
-        """Load applications info from cache."""
+    def _load_apps_info() -> Mapping:
+        """Load applications info from cache, as a read-only snapshot."""
         try:
-            apps_info = JSONManager.load(CONFIG.INTERNAL_PROGRAM_NAME, "apps_info_cache.json", default={})
-            return apps_info
+            return AppInfoStore.get_instance().snapshot().apps
         except Exception as e:
             logger.error(f"Failed to load applications info for Dropdowns: {e}")
             return {}
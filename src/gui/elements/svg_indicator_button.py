@@ -1,6 +1,6 @@
 import logging
 import math
-from pathlib import Path
+from functools import lru_cache
 from typing import *
 
 from PyQt6.QtCore import QPointF, QSize, Qt, QRectF, QPoint, QByteArray
@@ -9,11 +9,22 @@ from PyQt6.QtSvg import QSvgRenderer
 from PyQt6.QtWidgets import QPushButton
 
 from src.data.config import CONFIG
-from src.utils.file_handling_utils import get_resource_path
+from src.utils.resource_pack import ResourcePack
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _indicator_svg() -> bytes:
+    """The indicator SVG with the configured colors, read and filled in once for all indicator buttons."""
+    svg = ResourcePack.get_instance().read_text(CONFIG.INTERNAL_INDICATOR_SVG_PATH)
+    if not svg:
+        raise FileNotFoundError(f"Indicator SVG {CONFIG.INTERNAL_INDICATOR_SVG_PATH} could not be loaded")
+    return (svg.replace("{indicator}", CONFIG.ACCENT_COLOR_MUTED).
+            replace("{ring_fill}", CONFIG.RING_FILL).
+            replace("{ring_stroke}", CONFIG.RING_STROKE)).encode("utf-8")
+
+
 class SVGIndicatorButton(QPushButton):
     def __init__(self,
                  object_name: str,
@@ -27,19 +38,12 @@ class SVGIndicatorButton(QPushButton):
         self.button_size = size
 
         try:
-            svg_path = Path(get_resource_path(CONFIG.INTERNAL_INDICATOR_SVG_PATH))
-            if not svg_path.exists():
-                raise FileNotFoundError(f"SVG file not found at {svg_path}")
-            svg = Path(svg_path).read_text()
-            svg = (svg.replace("{indicator}", CONFIG.ACCENT_COLOR_MUTED).
-                   replace("{ring_fill}", CONFIG.RING_FILL).
-                   replace("{ring_stroke}", CONFIG.RING_STROKE))
+            svg = _indicator_svg()
         except Exception as e:
             logger.error(f"Failed to load or process Indicator SVG for button initialization: {e}")
             raise
 
-        # self.svg_renderer = QSvgRenderer(str(svg_path))
-        self.svg_renderer = QSvgRenderer(QByteArray(svg.encode("utf-8")))
+        self.svg_renderer = QSvgRenderer(QByteArray(svg))
 
         # Initialize rotation angle with the starting offset
         self.rotation_angle = 22.5
@@ -289,27 +289,35 @@ class PieMenu(QWidget):
 
         return opacity_animation
 
-    def update_button_ui(self, updated_button_config):
-        """Update button UI in the main thread."""
+    def update_button_ui(self, changed_buttons) -> int:
+        """Update the buttons of this menu that are in changed_buttons, in the main thread.
+
+        Returns:
+            The number of buttons that were updated.
+        """
+        indexes = [index for index in self.pie_buttons if self.pie_buttons[index].index in changed_buttons]
+        if not indexes:
+            return 0
+
         was_visible = self.isVisible()
 
-        # Directly update each pie_button with the properties from updates
-        for pie_button in list(self.pie_buttons.values()):
-            if updated_button_config[pie_button.index]["task_type"] in BUTTON_TYPES.keys():
-                button_type = updated_button_config[pie_button.index]["task_type"]
-                if pie_button.button_type != button_type:
-                    # Hide the menu if it's visible during replacement
-                    was_visible = self.isVisible()
-                    if was_visible:
-                        self.hide()
-                    self.replace_pie_button(pie_button.index % 8, BUTTON_TYPES[button_type])
+        for index in indexes:
+            pie_button = self.pie_buttons[index]
+            button_type = changed_buttons[pie_button.index]["task_type"]
+            if button_type in BUTTON_TYPES.keys() and pie_button.button_type != button_type:
+                # Hide the menu if it's visible during replacement
+                if self.isVisible():
+                    self.hide()
+                self.replace_pie_button(pie_button.index % 8, BUTTON_TYPES[button_type])
 
         # Show the menu again if it was visible before
-        if was_visible:
+        if was_visible and not self.isVisible():
             self.show()
 
-        for pie_button in self.pie_buttons.values():
-            pie_button.update_button(updated_button_config[pie_button.index]['properties'])
+        for index in indexes:
+            pie_button = self.pie_buttons[index]
+            pie_button.update_button(changed_buttons[pie_button.index]['properties'])
+        return len(indexes)
 
 
 class PrimaryPieMenu(PieMenu):
@@ -1,5 +1,6 @@
 import logging
 import threading
+from functools import partial
 from threading import Lock
 from typing import Dict, Tuple, Optional, Type, List
 
@@ -16,8 +17,13 @@ from src.events import ShowWindowEvent, HotkeyReleaseEvent
 from src.gui.buttons.pie_button import PieButton
 from src.gui.menus.pie_menu import PieMenu, PrimaryPieMenu, SecondaryPieMenu
 from src.gui.menus.special_menu import SpecialMenu
+from src.helper.window_event_source import WindowEventTracker, WinEventHookSource
+from src.helper.refresh_scheduler import RefreshScheduler
+from src.helper.window_scanner import WindowScanner, ScanResult
+from src.utils.icon_utils import pixmap_cache
 from src.utils.program_utils import restart_program, get_active_setup_screen, get_screen_dpi
-from src.utils.window_utils import get_filtered_list_of_windows, load_cache, update_icon_paths_in_cache
+from src.utils.window_utils import scan_windows, update_icon_paths_in_cache, get_window_entry, add_hwnd_to_exclude, \
+    app_info_store, validate_icon_path, set_app_info_updated_callback, maintain_app_cache, icon_service
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +33,8 @@ class PieWindow(QMainWindow):
 
     # Add a custom signal for thread-safe updates
     update_buttons_signal = pyqtSignal(dict)
+    # Emitted (from the event hook thread) when window events changed the open windows
+    windows_changed_signal = pyqtSignal()
 
     def __init__(self):
         super().__init__()
@@ -36,13 +44,20 @@ class PieWindow(QMainWindow):
         self.special_menu: Optional[SpecialMenu] = None
         self.pie_menus_primary: Optional[List[PieMenu]] = None
         self.pie_menus_secondary: Optional[List[PieMenu]] = None
-        self.auto_refresh_timer: Optional[QTimer] = None
+        self.refresh_scheduler: Optional[RefreshScheduler] = None
+        self.monitor_check_timer: Optional[QTimer] = None
+        self.event_refresh_timer: Optional[QTimer] = None
+        self.window_event_tracker: Optional[WindowEventTracker] = None
+        self.window_scanner: Optional[WindowScanner] = None
 
         self.manager = WindowManager.get_instance()
         self.button_info: ButtonInfo = ButtonInfo.get_instance()
+        self.manager.set_app_info_store(app_info_store)
+        self.manager.set_icon_path_validator(validate_icon_path)
 
         self.pie_menu_pos = QPoint()
         self.button_mapping_lock = Lock()
+        self.buttons_touched = 0  # Pie buttons updated by button updates, see update_button_ui
 
         self.primary_screen: QScreen = get_active_setup_screen()
         self.last_dpi: float = get_screen_dpi(self.primary_screen)
@@ -51,23 +66,77 @@ class PieWindow(QMainWindow):
         self.is_window_open = False
         self.cursor_displacement = (0, 0)  # Track how much the cursor has been moved
 
-        # Check if the icons still exist, otherwise delete entries so they can update again
-        update_icon_paths_in_cache()
-
         self.initialize_ui()
         self.setup_window()
+        # Excluded up front, so the scanner thread never has to touch the widget
+        add_hwnd_to_exclude(self)
         self.connect_signals()
         self.auto_refresh()
 
     # region Initialization and Setup
     def connect_signals(self):
         self.update_buttons_signal.connect(self.update_button_ui)
-
-        # Start auto-refreshing every REFRESH_INTERVAL milliseconds
-        self.auto_refresh_timer = QTimer(self)
-        self.auto_refresh_timer.timeout.connect(self.auto_refresh)
-        self.auto_refresh_timer.timeout.connect(self.handle_monitor_setup_change)
-        self.auto_refresh_timer.start(CONFIG.REFRESH_INTERVAL)  # Periodic refresh
+        self.windows_changed_signal.connect(self.schedule_event_refresh)
+
+        self.window_scanner = WindowScanner(scan_windows, self.manager.get_snapshot, parent=self)
+        self.window_scanner.scan_finished.connect(self.handle_scan_finished)
+        self.window_scanner.start()
+
+        # Extracted icons replace the placeholders right away; the next assignment stores their paths
+        icon_service.icon_ready.connect(self.handle_icon_ready)
+
+        # Resolved app names only show up after the buttons are reassigned
+        set_app_info_updated_callback(lambda _exe_name: self.window_scanner.request_scan(force_refresh=True))
+        # Icons are validated lazily when shown; the full check runs once the UI is up
+        QTimer.singleShot(CONFIG.INTERNAL_ICON_SWEEP_DELAY, update_icon_paths_in_cache)
+
+        # Keeps the app info cache and the icons folder bounded over long uptimes
+        self.cache_maintenance_timer = QTimer(self)
+        self.cache_maintenance_timer.timeout.connect(self.maintain_app_cache)
+        self.cache_maintenance_timer.start(CONFIG.INTERNAL_CACHE_MAINTENANCE_INTERVAL)
+        QTimer.singleShot(CONFIG.INTERNAL_ICON_SWEEP_DELAY, self.maintain_app_cache)
+
+        # Bursts of window events are coalesced into a single button refresh
+        self.event_refresh_timer = QTimer(self)
+        self.event_refresh_timer.setSingleShot(True)
+        self.event_refresh_timer.timeout.connect(self.refresh_from_events)
+
+        self.monitor_check_timer = QTimer(self)
+        self.monitor_check_timer.timeout.connect(self.handle_monitor_setup_change)
+        self.monitor_check_timer.start(CONFIG.REFRESH_INTERVAL)
+
+        # With window events running, polling is only a slow safety net
+        base_interval = CONFIG.INTERNAL_SAFETY_REFRESH_INTERVAL if self.start_window_events() else CONFIG.REFRESH_INTERVAL
+        self.refresh_scheduler = RefreshScheduler(
+            scanner=self.window_scanner,
+            snapshot_func=self.manager.get_snapshot,
+            is_pie_visible=self.isVisible,
+            min_interval=min(CONFIG.INTERNAL_REFRESH_MIN_INTERVAL, CONFIG.REFRESH_INTERVAL),
+            base_interval=base_interval,
+            max_interval=max(CONFIG.INTERNAL_REFRESH_MAX_INTERVAL, base_interval),
+            activity_window=CONFIG.INTERNAL_REFRESH_ACTIVITY_WINDOW,
+            parent=self
+        )
+        self.refresh_scheduler.start()
+
+    def start_window_events(self) -> bool:
+        """Start event-driven window tracking. Returns False if it is disabled or unavailable."""
+        if not CONFIG.WINDOW_EVENTS_ENABLED:
+            return False
+        try:
+            self.window_event_tracker = WindowEventTracker(
+                source=WinEventHookSource(),
+                resolve_window=partial(get_window_entry, this_program_hwnd=int(self.winId())),
+                manager=self.manager,
+                on_change=self.windows_changed_signal.emit
+            )
+            self.window_event_tracker.start()
+            logger.info("Event-driven window tracking started.")
+            return True
+        except Exception as e:
+            logger.error(f"Could not start window event tracking, falling back to polling: {e}", exc_info=True)
+            self.window_event_tracker = None
+            return False
 
     def initialize_ui(self):
         """Set up all UI components and data structures."""
@@ -120,6 +189,8 @@ class PieWindow(QMainWindow):
                     if sibling is not pie_menu and isinstance(sibling, PieMenu):
                         sibling.hide()
                 pie_menu.show()
+                self.refresh_scheduler.record_open()
+                self.refresh_scheduler.note_activity()
                 if "Task" in pie_menu.view.objectName():
                     self.refresh()
                 self.pie_menu_pos = self.show_pie_menu_at_mouse_pos(
@@ -187,16 +258,13 @@ class PieWindow(QMainWindow):
         else:
             logger.error("No SpecialMenu here...")
 
-    def refresh(self, reassign_all_buttons: bool = False):
+    def refresh(self, reassign_all_buttons: bool = False, skip_if_unchanged: bool = False):
         # Start the background task
-        app_info_cache = load_cache()
-        self.manager.set_app_info_cache(app_info_cache)
-
         # Create a method that wraps the thread's work
         def update_thread_wrapper():
             try:
                 self.manager.update_button_window_assignment(
-                    self, self.button_info, reassign_all_buttons
+                    self, self.button_info, reassign_all_buttons, skip_if_unchanged
                 )
             except Exception as e:
                 logger.error(f"Error in update_button_window_assignment thread: {e}", exc_info=True)
@@ -209,37 +277,63 @@ class PieWindow(QMainWindow):
         ).start()
 
     def auto_refresh(self):
-        """Automatically monitor and refresh windows periodically in a thread-safe way."""
+        """Request a background scan; buttons are only reassigned if the open windows changed."""
+        self.window_scanner.request_scan()
 
-        # Lock access to shared data to ensure thread safety
+    def prefetch_windows(self):
+        """Scan right away, e.g. on hotkey press, so the pie menu likely opens with fresh windows. Thread-safe."""
+        self.refresh_scheduler.prefetch()
+
+    @pyqtSlot(str, str)
+    def handle_icon_ready(self, exe_name: str, icon_path: str):
+        """Show a freshly extracted icon on the buttons that display a placeholder for this app."""
+        for pie_menu in self.pie_menus_primary + self.pie_menus_secondary:
+            for pie_button in pie_menu.pie_buttons.values():
+                pie_button.set_ready_icon(exe_name, icon_path)
+        # Reassign, so the button config picks up the icon path instead of keeping the placeholder state
+        self.window_scanner.request_scan(force_refresh=True)
+
+    def maintain_app_cache(self):
+        """Evict stale app info entries and orphaned icons, keeping everything the buttons use."""
+        maintain_app_cache(self.button_info.get_all_tasks())
+
+    @pyqtSlot(object)
+    def handle_scan_finished(self, result: ScanResult):
+        """Runs on the GUI thread once the scanner published a new snapshot."""
+        if result.diff.is_empty() and not result.request.force_refresh:
+            return
         with self.button_mapping_lock:
-            current_window_handles = [
-                values[0] for values in get_filtered_list_of_windows(self).values()
-            ]
-            # Compare against WindowManager's last_window_handles
-            if current_window_handles != self.manager.last_window_handles:
-                self.manager.last_window_handles = current_window_handles
-                self.refresh()
+            self.refresh(result.request.reassign_all_buttons)
 
-    def force_refresh(self, reassign_all_buttons: bool = False):
-        """Automatically monitor and refresh windows periodically in a thread-safe way."""
+    @pyqtSlot()
+    def schedule_event_refresh(self):
+        """Restart the coalescing timer for event-driven refreshes."""
+        self.event_refresh_timer.start(50)
+
+    def refresh_from_events(self):
+        """Reassign buttons after window events already updated the WindowManager."""
         with self.button_mapping_lock:
-            current_window_handles = [
-                values[0] for values in get_filtered_list_of_windows(self).values()
-            ]
-            self.manager.last_window_handles = current_window_handles
-            self.refresh(reassign_all_buttons)
+            self.refresh(skip_if_unchanged=True)
+
+    def force_refresh(self, reassign_all_buttons: bool = False):
+        """Rescan the windows in the background and reassign buttons even if nothing changed."""
+        self.window_scanner.request_scan(reassign_all_buttons, force_refresh=True)
 
     @pyqtSlot(dict)
-    def update_button_ui(self, updated_button_config):
+    def update_button_ui(self, changed_buttons):
+        """Apply the buttons that changed since the last update; all other buttons are left alone."""
         # Save updates to global Button Info
-        self.button_info.button_info_dict = updated_button_config
+        self.button_info.button_info_dict.update(changed_buttons)
 
         self.button_info.has_unsaved_changes = True
         self.button_info.save_to_json()
 
+        touched = 0
         for pie_menu in self.pie_menus_primary + self.pie_menus_secondary:
-            pie_menu.update_button_ui(updated_button_config)
+            touched += pie_menu.update_button_ui(changed_buttons)
+        self.buttons_touched += touched
+        logger.debug(f"Touched {touched} of {len(changed_buttons)} changed buttons "
+                     f"({self.buttons_touched} in total). Pixmap cache: {pixmap_cache.stats()}")
 
     # endregion
 
@@ -0,0 +1,154 @@
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional, Dict, Any, Deque, Set, Tuple, List
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+# (exe_name, exe_path, hwnd)
+IconRequest = Tuple[str, str, int]
+
+
+class IconService(QObject):
+    """
+    Extracts app icons on a small worker pool, so a new window never waits for its icon.
+
+    Requests go through a queue and are deduplicated per exe while in flight. Each worker
+    runs worker_init once when it starts (e.g. COM initialisation) instead of once per icon.
+    When an icon is ready, on_extracted is called on the worker and icon_ready is emitted,
+    which Qt delivers on the GUI thread.
+    """
+
+    icon_ready = pyqtSignal(str, str)  # exe_name, icon_path
+
+    def __init__(self,
+                 extract_func: Callable[[str, int], Optional[str]],
+                 on_extracted: Optional[Callable[[str, str], None]] = None,
+                 worker_init: Optional[Callable[[], None]] = None,
+                 worker_exit: Optional[Callable[[], None]] = None,
+                 max_workers: int = 2,
+                 parent: Optional[QObject] = None):
+        """
+        Args:
+            extract_func: Extracts and saves the icon for (exe_path, hwnd), returning its path or None.
+            on_extracted: Called on the worker with (exe_name, icon_path), e.g. to update the app info cache.
+            worker_init: Runs once on each worker thread before the first extraction.
+            worker_exit: Runs once on each worker thread when the service stops.
+            max_workers: Number of worker threads.
+        """
+        super().__init__(parent)
+        self.extract_func = extract_func
+        self.on_extracted = on_extracted
+        self.worker_init = worker_init
+        self.worker_exit = worker_exit
+        self.max_workers = max_workers
+
+        self._queue: "queue.Queue[Optional[IconRequest]]" = queue.Queue()
+        self._in_flight: Set[str] = set()
+        self._lock = threading.Lock()
+        self._workers: List[threading.Thread] = []
+
+        self.requested = 0
+        self.deduplicated = 0
+        self.extracted = 0
+        self.failed = 0
+        self.max_queue_depth = 0
+        self.extraction_times: Deque[float] = deque(maxlen=100)
+
+    def start(self) -> None:
+        with self._lock:
+            if self._workers:
+                return
+            self._workers = [
+                threading.Thread(target=self._run, daemon=True, name=f"IconWorker-{i}")
+                for i in range(self.max_workers)
+            ]
+        for worker in self._workers:
+            worker.start()
+
+    def stop(self) -> None:
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for _ in workers:
+            self._queue.put(None)
+
+    def request(self, exe_name: str, exe_path: str, hwnd: int = 0) -> bool:
+        """Queue an icon extraction; thread-safe. Returns False if one for this exe is already queued or running."""
+        with self._lock:
+            self.requested += 1
+            if exe_name in self._in_flight:
+                self.deduplicated += 1
+                return False
+            self._in_flight.add(exe_name)
+        self._queue.put((exe_name, exe_path, hwnd))
+        self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+        return True
+
+    def is_pending(self, exe_name: str) -> bool:
+        with self._lock:
+            return exe_name in self._in_flight
+
+    def stats(self) -> Dict[str, Any]:
+        times = list(self.extraction_times)
+        return {
+            "queue_depth": self._queue.qsize(),
+            "max_queue_depth": self.max_queue_depth,
+            "in_flight": len(self._in_flight),
+            "requested": self.requested,
+            "deduplicated": self.deduplicated,
+            "extracted": self.extracted,
+            "failed": self.failed,
+            "extraction_ms": {
+                "mean": round(sum(times) / len(times) * 1000, 1) if times else None,
+                "max": round(max(times) * 1000, 1) if times else None,
+            },
+        }
+
+    def _run(self) -> None:
+        if self.worker_init is not None:
+            try:
+                self.worker_init()
+            except Exception as e:
+                logger.error(f"Error initializing icon worker: {e}")
+        try:
+            while True:
+                request = self._queue.get()
+                if request is None:
+                    return
+                self._extract(*request)
+        finally:
+            if self.worker_exit is not None:
+                try:
+                    self.worker_exit()
+                except Exception as e:
+                    logger.error(f"Error shutting down icon worker: {e}")
+
+    def _extract(self, exe_name: str, exe_path: str, hwnd: int) -> None:
+        start = time.perf_counter()
+        try:
+            icon_path = self.extract_func(exe_path, hwnd)
+        except Exception as e:
+            logger.error(f"Error extracting icon for {exe_name}: {e}")
+            icon_path = None
+        self.extraction_times.append(time.perf_counter() - start)
+
+        try:
+            if not icon_path:
+                self.failed += 1
+                return
+            self.extracted += 1
+            if self.on_extracted is not None:
+                self.on_extracted(exe_name, icon_path)
+        except Exception as e:
+            logger.error(f"Error storing icon for {exe_name}: {e}")
+            return
+        finally:
+            with self._lock:
+                self._in_flight.discard(exe_name)
+
+        logger.debug(f"Icon for {exe_name} ready. Icon service: {self.stats()}")
+        self.icon_ready.emit(exe_name, icon_path)
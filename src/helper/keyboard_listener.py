@@ -79,6 +79,9 @@ class HotkeyListener:
 
         logger.debug(f"Hotkey '{hotkey_name}' pressed. Starting handling process.")
 
+        # Start scanning before the ShowWindowEvent is posted, so the snapshot is fresh when the menu opens
+        self.main_window.prefetch_windows()
+
         self.initial_mouse_pos = QCursor.pos()  # Store initial mouse position using QCursor
 
         try:
@@ -0,0 +1,154 @@
+import logging
+import time
+from collections import deque
+from typing import Callable, Optional, Dict, Any, Deque
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal, pyqtSlot
+
+from src.helper.window_scanner import WindowScanner, ScanResult
+from src.data.window_snapshot_store import WindowSnapshot
+
+logger = logging.getLogger(__name__)
+
+MAX_BACKOFF_STEPS = 8
+
+
+class RefreshScheduler(QObject):
+    """
+    Decides when the WindowScanner runs, instead of a fixed interval timer.
+
+    - Around user activity (hotkey, open pie menu) it scans every min_interval.
+    - Otherwise it scans every base_interval and doubles the interval after each scan
+      that found no changes, up to max_interval.
+    - A tick is skipped if a scan is still in flight or the snapshot is fresher than min_interval.
+    - prefetch() requests a scan immediately and can be called from any thread, e.g. on hotkey press.
+      Freshness is best-effort: the menu may open before that scan finishes and then shows the previous
+      snapshot until the scan's result arrives.
+    """
+
+    _prefetch_signal = pyqtSignal()
+
+    def __init__(self,
+                 scanner: WindowScanner,
+                 snapshot_func: Callable[[], WindowSnapshot],
+                 is_pie_visible: Callable[[], bool],
+                 min_interval: int,
+                 base_interval: int,
+                 max_interval: int,
+                 activity_window: int,
+                 parent: Optional[QObject] = None):
+        """
+        Args:
+            scanner: The scanner to drive.
+            snapshot_func: Returns the current snapshot, used for freshness and staleness.
+            is_pie_visible: Whether a pie menu is shown, which counts as activity.
+            min_interval: Interval (ms) during activity.
+            base_interval: Interval (ms) right after a change.
+            max_interval: Upper bound (ms) when idle.
+            activity_window: How long (ms) after the last activity the fast interval is kept.
+        """
+        super().__init__(parent)
+        self.scanner = scanner
+        self.snapshot_func = snapshot_func
+        self.is_pie_visible = is_pie_visible
+        self.min_interval = min_interval
+        self.base_interval = max(base_interval, min_interval)
+        self.max_interval = max(max_interval, self.base_interval)
+        self.activity_window = activity_window / 1000
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.tick)
+        self._prefetch_signal.connect(self._handle_prefetch)
+        self.scanner.scan_finished.connect(self.handle_scan_finished)
+
+        self._last_activity = 0.0
+        self._idle_streak = 0
+        self._started_at = time.monotonic()
+        self.interval = self.base_interval
+
+        self.ticks = 0
+        self.scans = 0
+        self.skipped = 0
+        self.prefetches = 0
+        self.staleness_at_open: Deque[float] = deque(maxlen=100)
+
+    def start(self) -> None:
+        self._started_at = time.monotonic()
+        self._timer.start(self.interval)
+
+    def stop(self) -> None:
+        self._timer.stop()
+
+    def prefetch(self) -> None:
+        """
+        High-priority scan, e.g. the moment the hotkey is pressed. Thread-safe.
+
+        The scan is queued right away (request_scan() is locked); the bookkeeping is
+        marshalled onto the GUI thread, which owns the timer and the counters.
+        """
+        self.scanner.request_scan()
+        self._prefetch_signal.emit()
+
+    @pyqtSlot()
+    def _handle_prefetch(self) -> None:
+        self.prefetches += 1
+        self.note_activity()
+
+    @pyqtSlot()
+    def note_activity(self) -> None:
+        """Switch to the fast interval; re-arms the timer if it is waiting longer than that."""
+        self._last_activity = time.monotonic()
+        self._idle_streak = 0
+        if self._timer.remainingTime() > self.min_interval:
+            self._rearm()
+
+    def record_open(self) -> float:
+        """Record how old the window snapshot is when a pie menu opens. Returns the age in ms."""
+        staleness = self.snapshot_func().age() * 1000
+        self.staleness_at_open.append(staleness)
+        logger.debug(f"Pie menu opened with a {staleness:.0f} ms old window snapshot. Scheduler: {self.stats()}")
+        return staleness
+
+    @pyqtSlot()
+    def tick(self) -> None:
+        self.ticks += 1
+        if self.scanner.is_busy() or self.snapshot_func().age() * 1000 < self.min_interval:
+            # A scan is already coming, or window events just refreshed the snapshot
+            self.skipped += 1
+        else:
+            self.scanner.request_scan()
+        self._rearm()
+
+    @pyqtSlot(object)
+    def handle_scan_finished(self, result: ScanResult) -> None:
+        self.scans += 1
+        if result.diff.is_empty():
+            self._idle_streak = min(self._idle_streak + 1, MAX_BACKOFF_STEPS)
+        else:
+            self._idle_streak = 0
+
+    def next_interval(self) -> int:
+        if self.is_pie_visible() or time.monotonic() - self._last_activity < self.activity_window:
+            return self.min_interval
+        return min(self.max_interval, self.base_interval * 2 ** self._idle_streak)
+
+    def stats(self) -> Dict[str, Any]:
+        elapsed_minutes = max(time.monotonic() - self._started_at, 1e-6) / 60
+        staleness = self.staleness_at_open
+        return {
+            "interval_ms": self.interval,
+            "ticks": self.ticks,
+            "skipped": self.skipped,
+            "prefetches": self.prefetches,
+            "scans_per_minute": round(self.scans / elapsed_minutes, 2),
+            "staleness_at_open_ms": {
+                "last": round(staleness[-1]) if staleness else None,
+                "mean": round(sum(staleness) / len(staleness)) if staleness else None,
+                "max": round(max(staleness)) if staleness else None,
+            },
+        }
+
+    def _rearm(self) -> None:
+        self.interval = self.next_interval()
+        self._timer.start(self.interval)
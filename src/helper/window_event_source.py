@@ -0,0 +1,247 @@
+import ctypes
+import logging
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Optional, Tuple, List, Iterable, TYPE_CHECKING
+
+from src.data.window_snapshot_store import WindowDelta
+
+if TYPE_CHECKING:
+    from src.data.window_manager import WindowManager
+
+logger = logging.getLogger(__name__)
+
+# WinEvent constants (winuser.h)
+EVENT_SYSTEM_FOREGROUND = 0x0003
+EVENT_OBJECT_CREATE = 0x8000
+EVENT_OBJECT_DESTROY = 0x8001
+EVENT_OBJECT_SHOW = 0x8002
+EVENT_OBJECT_HIDE = 0x8003
+EVENT_OBJECT_NAMECHANGE = 0x800C
+EVENT_OBJECT_CLOAKED = 0x8017
+EVENT_OBJECT_UNCLOAKED = 0x8018
+OBJID_WINDOW = 0
+CHILDID_SELF = 0
+WINEVENT_OUTOFCONTEXT = 0x0000
+WINEVENT_SKIPOWNPROCESS = 0x0002
+WM_QUIT = 0x0012
+
+
+class WindowEventKind(Enum):
+    CREATED = "created"
+    DESTROYED = "destroyed"
+    SHOWN = "shown"
+    HIDDEN = "hidden"
+    RENAMED = "renamed"
+    CLOAKED = "cloaked"
+    UNCLOAKED = "uncloaked"
+    FOREGROUND = "foreground"
+
+
+# Events after which a window can no longer be listed
+REMOVING_EVENT_KINDS = {WindowEventKind.DESTROYED, WindowEventKind.HIDDEN, WindowEventKind.CLOAKED}
+
+_WIN_EVENT_KINDS = {
+    EVENT_SYSTEM_FOREGROUND: WindowEventKind.FOREGROUND,
+    EVENT_OBJECT_CREATE: WindowEventKind.CREATED,
+    EVENT_OBJECT_DESTROY: WindowEventKind.DESTROYED,
+    EVENT_OBJECT_SHOW: WindowEventKind.SHOWN,
+    EVENT_OBJECT_HIDE: WindowEventKind.HIDDEN,
+    EVENT_OBJECT_NAMECHANGE: WindowEventKind.RENAMED,
+    EVENT_OBJECT_CLOAKED: WindowEventKind.CLOAKED,
+    EVENT_OBJECT_UNCLOAKED: WindowEventKind.UNCLOAKED,
+}
+
+
+@dataclass(frozen=True)
+class WindowEvent:
+    kind: WindowEventKind
+    hwnd: int
+
+
+WindowEventCallback = Callable[[WindowEvent], None]
+
+
+class WindowEventSource(ABC):
+    """Pushes window lifecycle events to a callback until stopped."""
+
+    @abstractmethod
+    def start(self, callback: WindowEventCallback) -> None:
+        """Start delivering events to the callback."""
+
+    @abstractmethod
+    def stop(self) -> None:
+        """Stop delivering events."""
+
+
+class ScriptedWindowEventSource(WindowEventSource):
+    """Fake event source that replays scripted events, so delta handling can run without Win32."""
+
+    def __init__(self, events: Iterable[Tuple[WindowEventKind, int]] = ()):
+        self._pending: List[WindowEvent] = [WindowEvent(kind, hwnd) for kind, hwnd in events]
+        self._callback: Optional[WindowEventCallback] = None
+
+    def start(self, callback: WindowEventCallback) -> None:
+        self._callback = callback
+
+    def stop(self) -> None:
+        self._callback = None
+
+    def push(self, kind: WindowEventKind, hwnd: int) -> None:
+        """Queue an event to be delivered on the next play()."""
+        self._pending.append(WindowEvent(kind, hwnd))
+
+    def play(self) -> int:
+        """Deliver all queued events in order and return how many were delivered."""
+        if self._callback is None:
+            return 0
+        events, self._pending = self._pending, []
+        for event in events:
+            self._callback(event)
+        return len(events)
+
+
+class WinEventHookSource(WindowEventSource):
+    """Event source backed by SetWinEventHook, running its own message loop thread."""
+
+    def __init__(self):
+        self._callback: Optional[WindowEventCallback] = None
+        self._thread: Optional[threading.Thread] = None
+        self._thread_id: int = 0
+        self._hook_proc = None  # Keep the ctypes callback alive while hooks are installed
+        self._ready = threading.Event()
+
+    def start(self, callback: WindowEventCallback) -> None:
+        if self._thread is not None:
+            return
+        self._callback = callback
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="WinEventHookThread")
+        self._thread.start()
+        self._ready.wait(timeout=2)
+
+    def stop(self) -> None:
+        if self._thread_id:
+            ctypes.windll.user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+        self._thread = None
+        self._thread_id = 0
+
+    def _run(self) -> None:
+        from ctypes import wintypes
+
+        user32 = ctypes.windll.user32
+        win_event_proc_type = ctypes.WINFUNCTYPE(
+            None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+            wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+        )
+        user32.SetWinEventHook.restype = wintypes.HANDLE
+        user32.SetWinEventHook.argtypes = [
+            wintypes.DWORD, wintypes.DWORD, wintypes.HMODULE, win_event_proc_type,
+            wintypes.DWORD, wintypes.DWORD, wintypes.DWORD
+        ]
+
+        def handle_win_event(_hook, event, hwnd, id_object, id_child, _event_thread, _event_time):
+            # Only top-level window objects are of interest, not their controls or carets
+            if id_object != OBJID_WINDOW or id_child != CHILDID_SELF or not hwnd:
+                return
+            kind = _WIN_EVENT_KINDS.get(event)
+            if kind is None:
+                return
+            try:
+                self._callback(WindowEvent(kind, hwnd))
+            except Exception as e:
+                logger.error(f"Error handling window event {kind} for hwnd {hwnd}: {e}", exc_info=True)
+
+        self._hook_proc = win_event_proc_type(handle_win_event)
+        self._thread_id = ctypes.windll.kernel32.GetCurrentThreadId()
+
+        hooks = []
+        for event_min, event_max in ((EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_FOREGROUND),
+                                     (EVENT_OBJECT_CREATE, EVENT_OBJECT_HIDE),
+                                     (EVENT_OBJECT_NAMECHANGE, EVENT_OBJECT_NAMECHANGE),
+                                     (EVENT_OBJECT_CLOAKED, EVENT_OBJECT_UNCLOAKED)):
+            hook = user32.SetWinEventHook(event_min, event_max, 0, self._hook_proc, 0, 0,
+                                          WINEVENT_OUTOFCONTEXT | WINEVENT_SKIPOWNPROCESS)
+            if hook:
+                hooks.append(hook)
+            else:
+                logger.error(f"Failed to set WinEvent hook for range {event_min:#x}-{event_max:#x}")
+        self._ready.set()
+
+        # WinEvent callbacks are delivered through this thread's message queue
+        msg = wintypes.MSG()
+        while user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+            user32.TranslateMessage(ctypes.byref(msg))
+            user32.DispatchMessageW(ctypes.byref(msg))
+
+        for hook in hooks:
+            user32.UnhookWinEvent(hook)
+        logger.info("WinEvent hooks removed.")
+
+
+class WindowEventTracker:
+    """Turns window events into add/remove/retitle deltas and applies them to the WindowManager.
+
+    Foreground changes only update the WindowManager's most-recently-used order.
+    """
+
+    def __init__(self,
+                 source: WindowEventSource,
+                 resolve_window: Callable[[int], Optional[Tuple[str, str]]],
+                 manager: "WindowManager",
+                 on_change: Optional[Callable[[], None]] = None):
+        """
+        Args:
+            source: Where the window events come from.
+            resolve_window: Returns (title, exe_name) for a listable window, or None if it should not be listed.
+            manager: The WindowManager receiving the deltas.
+            on_change: Called after a non-empty delta has been applied.
+        """
+        self.source = source
+        self.resolve_window = resolve_window
+        self.manager = manager
+        self.on_change = on_change
+
+    def start(self) -> None:
+        self.source.start(self.handle_event)
+
+    def stop(self) -> None:
+        self.source.stop()
+
+    def handle_event(self, event: WindowEvent) -> None:
+        """Translate a single event into a delta and apply it."""
+        if event.kind is WindowEventKind.FOREGROUND:
+            # Only changes the recency order, which does not require reassigning buttons
+            self.manager.activate_window(event.hwnd)
+            return
+
+        delta = self.compute_delta(event)
+        if delta.is_empty():
+            return
+
+        diff = self.manager.apply_window_delta(delta)
+        if not diff.is_empty() and self.on_change:
+            self.on_change()
+
+    def compute_delta(self, event: WindowEvent) -> WindowDelta:
+        delta = WindowDelta()
+        hwnd = event.hwnd
+        current = self.manager.get_window_info(hwnd)
+
+        if event.kind in REMOVING_EVENT_KINDS:
+            if current is not None:
+                delta.removed.add(hwnd)
+            return delta
+
+        entry = self.resolve_window(hwnd)
+        if entry is None:
+            # e.g. the title became empty or the window is not top-level
+            if current is not None:
+                delta.removed.add(hwnd)
+        elif current is None:
+            delta.added[hwnd] = entry
+        elif (current[0], current[1]) != entry:
+            delta.retitled[hwnd] = entry
+        return delta
@@ -0,0 +1,132 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional, Dict, Any
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from src.data.window_snapshot_store import WindowDiff, WindowSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ScanRequest:
+    """What the pending scan should do once it finished. Coalesced requests are merged with OR."""
+    reassign_all_buttons: bool = False
+    force_refresh: bool = False
+
+    def merge(self, other: "ScanRequest") -> "ScanRequest":
+        return ScanRequest(self.reassign_all_buttons or other.reassign_all_buttons,
+                           self.force_refresh or other.force_refresh)
+
+
+@dataclass(frozen=True)
+class ScanResult:
+    snapshot: WindowSnapshot
+    diff: WindowDiff
+    request: ScanRequest
+    duration: float
+
+
+class WindowScanner(QObject):
+    """
+    Enumerates windows on its own thread, so the GUI thread never waits on Win32 or process queries.
+
+    Requests that arrive while a scan is pending are merged into it ("latest wins"), so a burst of
+    refresh requests costs one scan. Each finished scan is published with an immutable snapshot.
+    """
+
+    scan_finished = pyqtSignal(object)  # ScanResult
+
+    def __init__(self,
+                 scan_func: Callable[[], WindowDiff],
+                 snapshot_func: Callable[[], WindowSnapshot],
+                 parent: Optional[QObject] = None):
+        """
+        Args:
+            scan_func: Runs one enumeration and returns the diff, e.g. window_utils.scan_windows.
+            snapshot_func: Returns the snapshot to publish after the scan.
+        """
+        super().__init__(parent)
+        self.scan_func = scan_func
+        self.snapshot_func = snapshot_func
+
+        self._condition = threading.Condition()
+        self._pending: Optional[ScanRequest] = None
+        self._running = False
+        self._scanning = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.requested = 0
+        self.coalesced = 0
+        self.completed = 0
+        self.failed = 0
+        self.last_duration = 0.0
+
+    def start(self) -> None:
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True, name="WindowScannerThread")
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        self._thread = None
+
+    def request_scan(self, reassign_all_buttons: bool = False, force_refresh: bool = False) -> None:
+        """Queue a scan; safe to call from any thread. Merges with a scan that has not started yet."""
+        request = ScanRequest(reassign_all_buttons, force_refresh)
+        with self._condition:
+            self.requested += 1
+            if self._pending is None:
+                self._pending = request
+            else:
+                self._pending = self._pending.merge(request)
+                self.coalesced += 1
+            self._condition.notify()
+
+    def is_busy(self) -> bool:
+        """True while a scan is queued or running."""
+        with self._condition:
+            return self._scanning or self._pending is not None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requested": self.requested,
+            "coalesced": self.coalesced,
+            "completed": self.completed,
+            "failed": self.failed,
+            "last_duration_ms": round(self.last_duration * 1000, 1),
+        }
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while self._running and self._pending is None:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                request, self._pending = self._pending, None
+                self._scanning = True
+
+            start = time.perf_counter()
+            try:
+                diff = self.scan_func()
+                snapshot = self.snapshot_func()
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Window scan failed: {e}", exc_info=True)
+                continue
+            finally:
+                with self._condition:
+                    self._scanning = False
+            self.last_duration = time.perf_counter() - start
+            self.completed += 1
+
+            self.scan_finished.emit(ScanResult(snapshot, diff, request, self.last_duration))
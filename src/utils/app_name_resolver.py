@@ -0,0 +1,118 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Set, Tuple, Any
+
+logger = logging.getLogger(__name__)
+
+# (normalized exe_path, mtime_ns, size); a changed binary gets a new key
+BinaryKey = Tuple[str, int, int]
+
+
+def placeholder_app_name(exe_name: str) -> str:
+    """The name shown until the FileDescription is known, e.g. "Notepad" for notepad.exe."""
+    return os.path.splitext(exe_name)[0].capitalize()
+
+
+class AppNameResolver:
+    """
+    Looks up friendly app names (the FileDescription of the executable) on a worker pool.
+
+    resolve() never blocks on the version resource: it returns the memoized name, or a placeholder
+    while the lookup runs, and on_resolved(exe_name, app_name) is called once the real name is known.
+    Results are memoized by (exe_path, mtime, size), so each binary is queried once and an updated
+    binary is looked up again.
+    """
+
+    def __init__(self,
+                 lookup_func: Callable[[str, str], str],
+                 on_resolved: Optional[Callable[[str, str], None]] = None,
+                 max_workers: int = 2,
+                 stat_func: Callable[[str], Any] = os.stat):
+        """
+        Args:
+            lookup_func: Reads the friendly name for (exe_path, exe_name); slow, runs on the workers.
+            on_resolved: Called from a worker thread with (exe_name, app_name) after a lookup.
+            max_workers: Size of the worker pool.
+            stat_func: os.stat, replaceable to run without a filesystem.
+        """
+        self.lookup_func = lookup_func
+        self.on_resolved = on_resolved
+        self.stat_func = stat_func
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="AppNameResolver")
+
+        self._names: Dict[BinaryKey, str] = {}
+        self._latest_keys: Dict[str, BinaryKey] = {}  # normalized exe_path -> key of the last stat
+        self._in_flight: Set[BinaryKey] = set()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.lookups = 0
+        self.failures = 0
+
+    def resolve(self, exe_path: str, exe_name: str, placeholder: str = "") -> str:
+        """Return the friendly name if known, otherwise placeholder (or the exe-derived name) and look it up."""
+        fallback = placeholder or placeholder_app_name(exe_name)
+        key = self._key(exe_path)
+        if key is None:
+            return fallback
+
+        with self._lock:
+            self._latest_keys[key[0]] = key
+            name = self._names.get(key)
+            if name is not None:
+                self.hits += 1
+                return name
+            if key in self._in_flight:
+                return fallback
+            self._in_flight.add(key)
+
+        self._executor.submit(self._lookup, key, exe_path, exe_name)
+        return fallback
+
+    def peek(self, exe_path: str) -> Optional[str]:
+        """Return the memoized name of the last seen version of exe_path, without a stat or lookup."""
+        with self._lock:
+            key = self._latest_keys.get(os.path.normcase(exe_path))
+            return self._names.get(key) if key is not None else None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "memoized": len(self._names),
+            "in_flight": len(self._in_flight),
+            "hits": self.hits,
+            "lookups": self.lookups,
+            "failures": self.failures,
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _key(self, exe_path: str) -> Optional[BinaryKey]:
+        try:
+            result = self.stat_func(exe_path)
+        except OSError:
+            return None
+        return os.path.normcase(exe_path), result.st_mtime_ns, result.st_size
+
+    def _lookup(self, key: BinaryKey, exe_path: str, exe_name: str) -> None:
+        try:
+            name = self.lookup_func(exe_path, exe_name) or placeholder_app_name(exe_name)
+        except Exception as e:
+            logger.error(f"Error looking up the app name of {exe_path}: {e}")
+            with self._lock:
+                self.failures += 1
+                self._in_flight.discard(key)
+            return
+
+        with self._lock:
+            self.lookups += 1
+            self._names[key] = name
+            self._in_flight.discard(key)
+
+        if self.on_resolved is not None:
+            try:
+                self.on_resolved(exe_name, name)
+            except Exception as e:
+                logger.error(f"Error applying the app name of {exe_name}: {e}")
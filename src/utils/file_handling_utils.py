@@ -18,7 +18,6 @@ def get_resource_path(relative_path):
     """
     # Normalize the path to use the OS's path separator. This handles both / and \.
     normalized_path = os.path.normpath(relative_path)
-    logger.debug(f"get_resource_path (normalized): {normalized_path}")
 
     if hasattr(sys, '_MEIPASS'):
         # Running in PyInstaller bundle
@@ -149,7 +149,7 @@ def minimize_window_by_hwnd(hwnd: int):
     if hwnd and hwnd != win32gui.GetDesktopWindow():
         root_handle = win32gui.GetAncestor(hwnd, win32con.GA_ROOT)
 
-        if root_handle not in set(manager.get_open_windows_info().keys()):
+        if not manager.is_window_open(root_handle):
             logger.warning("Hwnd is not among valid windows")
             return
 
@@ -179,7 +179,7 @@ def toggle_maximize_window_at_cursor(pie_window: "PieWindow"):
     if window_handle and window_handle != win32gui.GetDesktopWindow():
         root_handle = win32gui.GetAncestor(window_handle, win32con.GA_ROOT)
 
-        if root_handle not in set(manager.get_open_windows_info().keys()):
+        if not manager.is_window_open(root_handle):
             logger.warning("Hwnd is not among valid windows")
             return
 
@@ -267,7 +267,7 @@ def center_window_at_cursor(pie_window: "PieWindow"):
 
     root_handle = win32gui.GetAncestor(window_handle, win32con.GA_ROOT)
 
-    if root_handle not in set(manager.get_open_windows_info().keys()):
+    if not manager.is_window_open(root_handle):
         logger.warning("Hwnd is not among valid windows")
         return
 
@@ -452,7 +452,7 @@ def close_window_at_cursor(pie_window: "PieWindow") -> None:
 
 def close_window_by_handle(hwnd):
     """Close a window given its handle."""
-    if hwnd not in set(manager.get_open_windows_info().keys()):
+    if not manager.is_window_open(hwnd):
         logger.warning("Hwnd is not among valid windows")
         return
 
@@ -0,0 +1,124 @@
+import ctypes
+import logging
+from ctypes import wintypes
+from typing import Optional
+
+from PyQt6 import sip
+from PyQt6.QtCore import QBuffer, QByteArray, QIODevice
+from PyQt6.QtGui import QImage
+
+logger = logging.getLogger(__name__)
+
+_user32 = ctypes.WinDLL("user32", use_last_error=True)
+_gdi32 = ctypes.WinDLL("gdi32", use_last_error=True)
+
+_BI_RGB = 0
+_DIB_RGB_COLORS = 0
+_DI_NORMAL = 0x0003
+
+
+class _BitmapInfoHeader(ctypes.Structure):
+    _fields_ = [
+        ("biSize", wintypes.DWORD),
+        ("biWidth", wintypes.LONG),
+        ("biHeight", wintypes.LONG),
+        ("biPlanes", wintypes.WORD),
+        ("biBitCount", wintypes.WORD),
+        ("biCompression", wintypes.DWORD),
+        ("biSizeImage", wintypes.DWORD),
+        ("biXPelsPerMeter", wintypes.LONG),
+        ("biYPelsPerMeter", wintypes.LONG),
+        ("biClrUsed", wintypes.DWORD),
+        ("biClrImportant", wintypes.DWORD),
+    ]
+
+
+_gdi32.CreateCompatibleDC.argtypes = [wintypes.HDC]
+_gdi32.CreateCompatibleDC.restype = wintypes.HDC
+_gdi32.CreateDIBSection.argtypes = [wintypes.HDC, ctypes.POINTER(_BitmapInfoHeader), wintypes.UINT,
+                                    ctypes.POINTER(ctypes.c_void_p), wintypes.HANDLE, wintypes.DWORD]
+_gdi32.CreateDIBSection.restype = wintypes.HBITMAP
+_gdi32.SelectObject.argtypes = [wintypes.HDC, wintypes.HGDIOBJ]
+_gdi32.SelectObject.restype = wintypes.HGDIOBJ
+_gdi32.DeleteObject.argtypes = [wintypes.HGDIOBJ]
+_gdi32.DeleteDC.argtypes = [wintypes.HDC]
+_gdi32.GdiFlush.argtypes = []
+_user32.DrawIconEx.argtypes = [wintypes.HDC, ctypes.c_int, ctypes.c_int, wintypes.HICON, ctypes.c_int, ctypes.c_int,
+                               wintypes.UINT, wintypes.HBRUSH, wintypes.UINT]
+_user32.DrawIconEx.restype = wintypes.BOOL
+_user32.DestroyIcon.argtypes = [wintypes.HICON]
+
+
+class HiconRenderer:
+    """
+    Renders HICONs into one reusable 32-bit DIB section and hands out its pixels as a QImage.
+
+    The memory DC and the bitmap are created once and reused for every icon of a batch, and
+    render() wraps the bitmap's bits in place instead of copying them. A renderer belongs to
+    one thread (each icon worker has its own); close() releases the GDI objects.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.stride = max_size * 4
+        self.rendered = 0
+
+        self._dc = _gdi32.CreateCompatibleDC(None)
+        if not self._dc:
+            raise ctypes.WinError(ctypes.get_last_error())
+
+        header = _BitmapInfoHeader(biSize=ctypes.sizeof(_BitmapInfoHeader), biWidth=max_size,
+                                   biHeight=-max_size,  # Top-down, the row order QImage expects
+                                   biPlanes=1, biBitCount=32, biCompression=_BI_RGB)
+        self._bits = ctypes.c_void_p()
+        self._bitmap = _gdi32.CreateDIBSection(self._dc, ctypes.byref(header), _DIB_RGB_COLORS,
+                                               ctypes.byref(self._bits), None, 0)
+        if not self._bitmap:
+            error = ctypes.WinError(ctypes.get_last_error())
+            _gdi32.DeleteDC(self._dc)
+            raise error
+        self._previous = _gdi32.SelectObject(self._dc, self._bitmap)
+
+    def render(self, icon_handle: int, size: int, destroy_icon: bool = True) -> QImage:
+        """
+        Draw the icon at size x size and return it as a QImage that shares the bitmap's memory.
+
+        The image is only valid until the next render() or close(); copy() it to keep it.
+        The icon is destroyed afterwards unless destroy_icon is False.
+        """
+        if size > self.max_size:
+            raise ValueError(f"Icon size {size} exceeds the renderer size {self.max_size}")
+        try:
+            ctypes.memset(self._bits, 0, self.stride * size)
+            if not _user32.DrawIconEx(self._dc, 0, 0, icon_handle, size, size, 0, None, _DI_NORMAL):
+                raise ctypes.WinError(ctypes.get_last_error())
+            _gdi32.GdiFlush()
+        finally:
+            if destroy_icon:
+                _user32.DestroyIcon(icon_handle)
+        self.rendered += 1
+        # DrawIconEx blends onto the cleared bitmap, so the BGRA bits are premultiplied ARGB32
+        return QImage(sip.voidptr(self._bits.value, self.stride * size), size, size, self.stride,
+                      QImage.Format.Format_ARGB32_Premultiplied)
+
+    def render_png(self, icon_handle: int, size: int, destroy_icon: bool = True) -> Optional[bytes]:
+        """Render the icon and encode it as PNG straight from the bitmap's memory."""
+        return encode_png(self.render(icon_handle, size, destroy_icon))
+
+    def close(self) -> None:
+        if self._dc:
+            _gdi32.SelectObject(self._dc, self._previous)
+            _gdi32.DeleteObject(self._bitmap)
+            _gdi32.DeleteDC(self._dc)
+            self._dc = None
+
+
+def encode_png(image: QImage) -> Optional[bytes]:
+    """Encode the image as PNG, or return None if it cannot be encoded."""
+    encoded = QByteArray()
+    buffer = QBuffer(encoded)
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    if not image.save(buffer, "PNG"):
+        logger.error("Could not encode icon as PNG")
+        return None
+    return bytes(encoded.data())
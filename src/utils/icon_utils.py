@@ -1,96 +1,224 @@
 # Define the icon file paths (use appropriate file paths)
 import logging
-from collections import defaultdict
+import os
+from typing import Optional, Tuple, Union
 
-from PyQt6.QtGui import QPixmap, QIcon, QImage
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QPixmap, QIcon, QImage, QPainter, QColor
 
+from src.data.config import CONFIG
+from src.data.icon_atlas import IconAtlas, atlas_key
 from src.data.icon_paths import EXTERNAL_ICON_PATHS
+from src.utils.pixmap_cache import PixmapCache, PixmapKey
+from src.utils.resource_pack import ResourcePack, resource_key, INVERTED_SUFFIX
 
 logger = logging.getLogger(__name__)
 
-# Cache to hold icons
-icon_cache = defaultdict(dict)
+# Icon transforms, combined with TRANSFORM_SEPARATOR; see transform_image()
+TRANSFORM_INVERTED = "inverted"  # White-on-dark variants of the black built-in icons
+TRANSFORM_TINT = "tint:"
+TRANSFORM_DESATURATED = "desaturated"
+TRANSFORM_PREMULTIPLIED = "premultiplied"
+TRANSFORM_SEPARATOR = "+"
+
+IconSource = Union[str, QImage, QPixmap]
+
+# One cache for all icons drawn by the program: pie buttons, special menus and the editor
+pixmap_cache = PixmapCache(CONFIG.INTERNAL_PIXMAP_CACHE_BUDGET)
 
 
 def get_icon(icon_name: str, is_inverted: bool = False):
     """
-    Load the icon based on the inverted_icons flag, with caching.
+    Load a built-in icon by name, served from the shared pixmap cache.
     """
-    # Check if the icon is already cached
-    if is_inverted:
-        if icon_name in icon_cache["inverted"]:
-            logger.info(f"Returning cached inverted icon for {icon_name}")
-            return icon_cache["inverted"][icon_name]
-        else:
-            icon_path = EXTERNAL_ICON_PATHS.get(icon_name)
-            if icon_path:
-                inverted_icon = invert_icon(icon_path)
-                icon_cache["inverted"][icon_name] = inverted_icon
-                return inverted_icon
-    else:
-        if icon_name in icon_cache["original"]:
-            logger.info(f"Returning cached original icon for {icon_name}")
-            return icon_cache["original"][icon_name]
+    icon_path = EXTERNAL_ICON_PATHS.get(icon_name)
+    if not icon_path:
+        return None  # In case icon name doesn't match
+    return QIcon(get_pixmap(icon_path, transform=TRANSFORM_INVERTED if is_inverted else ""))
+
+
+def get_pixmap(icon_path: str,
+               size: Optional[Tuple[int, int]] = None,
+               device_pixel_ratio: float = 1.0,
+               transform: str = "") -> QPixmap:
+    """
+    Return the icon as a pixmap from the shared cache, building it on a miss.
+
+    Args:
+        icon_path: An icon file, an "atlas:<key>" icon or a "res:<path>" built-in icon.
+        size: Logical size to scale to; the pixmap has size * device_pixel_ratio pixels. None keeps the original.
+        device_pixel_ratio: The ratio of the screen the pixmap is drawn on.
+        transform: A transform spec for transform_image(), e.g. TRANSFORM_INVERTED; "" for none.
+    """
+    key = PixmapKey(icon_path, _source_version(icon_path), device_pixel_ratio, size, transform)
+    return pixmap_cache.get_or_create(key, lambda: _build_pixmap(icon_path, size, device_pixel_ratio, transform))
+
+
+def _source_version(icon_path: str) -> int:
+    """mtime of the icon file, or the atlas content version (a hash of its images, changes when the icon is replaced)."""
+    if resource_key(icon_path) is not None:
+        return 0  # The resource pack does not change while the program runs
+    key = atlas_key(icon_path)
+    if key is not None:
+        entry = IconAtlas.get_instance().stat(key)
+        return entry.st_mtime_ns if entry is not None else -1
+    try:
+        return os.stat(icon_path).st_mtime_ns
+    except OSError:
+        return -1
+
+
+def _build_pixmap(icon_path: str, size: Optional[Tuple[int, int]], device_pixel_ratio: float, transform: str) -> QPixmap:
+    pixel_size = round(max(size) * device_pixel_ratio) if size is not None else None
+    icon_path, transform = _use_baked_variant(icon_path, transform)
+    pixmap = load_icon_pixmap(icon_path, pixel_size)
+    if pixmap.isNull():
+        return pixmap
+    if transform:
+        pixmap = QPixmap.fromImage(transform_image(pixmap, transform))
+    # Atlas icons usually come in the exact size, only file icons and in-between ratios are scaled
+    if size is not None and (pixmap.width(), pixmap.height()) != (round(size[0] * device_pixel_ratio),
+                                                                 round(size[1] * device_pixel_ratio)):
+        pixmap = pixmap.scaled(round(size[0] * device_pixel_ratio), round(size[1] * device_pixel_ratio),
+                               Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+    pixmap.setDevicePixelRatio(device_pixel_ratio)
+    return pixmap
+
+
+def _use_baked_variant(icon_path: str, transform: str) -> Tuple[str, str]:
+    """Swap an inverted built-in icon for its pre-inverted copy in the resource pack, if it has one."""
+    key = resource_key(icon_path)
+    steps = transform.split(TRANSFORM_SEPARATOR)
+    if key is None or steps[0] != TRANSFORM_INVERTED or f"{key}{INVERTED_SUFFIX}" not in ResourcePack.get_instance():
+        return icon_path, transform
+    return f"{icon_path}{INVERTED_SUFFIX}", TRANSFORM_SEPARATOR.join(steps[1:])
+
+
+def load_icon_pixmap(icon_path: str, pixel_size: Optional[int] = None) -> QPixmap:
+    """Load an icon file, or an "atlas:<key>" / "res:<path>" icon from the in-memory icon atlas / resource pack.
+
+    For atlas icons, pixel_size selects the stored resolution that fits best; None takes the largest.
+    """
+    res_key = resource_key(icon_path)
+    if res_key is not None:
+        pixmap = QPixmap()
+        data = ResourcePack.get_instance().read(res_key)
+        if data is None or not pixmap.loadFromData(data):
+            logger.warning(f"Icon {icon_path} could not be loaded from the resource pack")
+        return pixmap
+    key = atlas_key(icon_path)
+    if key is None:
+        return QPixmap(icon_path)
+    pixmap = QPixmap()
+    data = IconAtlas.get_instance().get(key, pixel_size)
+    if data is None or not pixmap.loadFromData(data, "PNG"):
+        logger.warning(f"Icon {icon_path} is not in the icon atlas")
+    return pixmap
+
+
+def invert_icon(icon: IconSource, return_pixmap: bool = False):
+    """Invert the colors of the icon, preserving the alpha channel."""
+    inverted_pixmap = QPixmap.fromImage(transform_image(icon, TRANSFORM_INVERTED))
+    if return_pixmap:
+        return inverted_pixmap
+    return QIcon(inverted_pixmap)
+
+
+def to_image(icon: IconSource) -> QImage:
+    """Return the icon (a file path, "atlas:<key>", "res:<path>", QImage or QPixmap) as a QImage."""
+    if isinstance(icon, QImage):
+        return icon
+    if isinstance(icon, QPixmap):
+        return icon.toImage()
+    return load_icon_pixmap(icon).toImage()
+
+
+def transform_image(icon: IconSource, transform: str) -> QImage:
+    """
+    Apply a transform spec to the icon, each step as one bulk operation over the whole image.
+
+    The spec joins steps with "+", applied left to right:
+        inverted       Invert RGB, keep alpha.
+        tint:#rrggbb   Paint every visible pixel in the color, keep alpha (e.g. the accent color).
+        desaturated    Grayscale, keep alpha (e.g. for disabled buttons).
+        premultiplied  Convert to premultiplied alpha, the format Qt draws fastest.
+    """
+    image = to_image(icon)
+    if not transform or image.isNull():
+        return image
+    # Straight alpha, so inverting and tinting do not touch the alpha channel
+    image = image.convertToFormat(QImage.Format.Format_ARGB32)
+    for step in transform.split(TRANSFORM_SEPARATOR):
+        if step == TRANSFORM_INVERTED:
+            image.invertPixels(QImage.InvertMode.InvertRgb)
+        elif step.startswith(TRANSFORM_TINT):
+            painter = QPainter(image)
+            painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceIn)
+            painter.fillRect(image.rect(), QColor(step[len(TRANSFORM_TINT):]))
+            painter.end()
+        elif step == TRANSFORM_DESATURATED:
+            gray = image.convertToFormat(QImage.Format.Format_Grayscale8).convertToFormat(QImage.Format.Format_ARGB32)
+            gray.setAlphaChannel(image.convertToFormat(QImage.Format.Format_Alpha8))
+            image = gray
+        elif step == TRANSFORM_PREMULTIPLIED:
+            image = image.convertToFormat(QImage.Format.Format_ARGB32_Premultiplied)
         else:
-            icon_path = EXTERNAL_ICON_PATHS.get(icon_name)
-            if icon_path:
-                original_icon = QIcon(icon_path)
-                icon_cache["original"][icon_name] = original_icon
-                return original_icon
-    return None  # In case icon name doesn't match
+            logger.warning(f"Unknown icon transform: {step}")
+    return image
 
 
-def invert_icon(icon_path: str, return_pixmap: bool = False):
-    """Invert the colors of the icon more efficiently, preserving the alpha channel."""
-    logger.debug(f"inverting icon {icon_path}")
+def transform_pixmap(icon: Union[QImage, QPixmap], transform: str) -> QPixmap:
+    """Transform an in-memory icon, cached in the shared pixmap cache by the image's cache key.
 
-    # Load the icon as QPixmap
-    pixmap = QPixmap(icon_path)
+    Use get_pixmap() for icons that have a path.
+    """
+    key = PixmapKey(f"qt:{icon.cacheKey()}", 0, 1.0, None, transform)
+    return pixmap_cache.get_or_create(key, lambda: QPixmap.fromImage(transform_image(icon, transform)))
 
-    # Convert QPixmap to QImage for manipulation
-    image = pixmap.toImage()
 
-    # Convert the image to a format that supports 32-bit color with alpha (RGBA)
-    # Use:
-    if image.format() != QImage.Format.Format_ARGB32:
-        image = image.convertToFormat(QImage.Format.Format_ARGB32)
+def tint_transform(color: str) -> str:
+    return f"{TRANSFORM_TINT}{color}"
 
-    # Access the pixel data directly using bits()
-    width, height = image.width(), image.height()
-
-    # Get a pointer to the pixel data
-    ptr = image.bits()
-    ptr.setsize(image.bytesPerLine() * image.height())
-    data = memoryview(ptr).cast("B")
-
-    # Iterate over the pixels and modify them
-    for y in range(height):
-        for x in range(width):
-            # Calculate the position of the pixel in the raw data
-            pixel_index = (y * width + x) * 4  # 4 bytes per pixel (RGBA)
-
-            # Use:
-            r = data[pixel_index]
-            g = data[pixel_index + 1]
-            b = data[pixel_index + 2]
-            a = data[pixel_index + 3]
-
-            if a == 0:  # Skip fully transparent pixels
-                continue
-
-            # Invert RGB values
-            inverted_r = 255 - r
-            inverted_g = 255 - g
-            inverted_b = 255 - b
-
-            # Use:
-            data[pixel_index] = inverted_r
-            data[pixel_index + 1] = inverted_g
-            data[pixel_index + 2] = inverted_b
-            data[pixel_index + 3] = a
-
-    # Convert the modified QImage back to QPixmap
-    inverted_pixmap = QPixmap.fromImage(image)
-    if return_pixmap:
-        return inverted_pixmap
-    return QIcon(inverted_pixmap)
+
+def run_benchmark(sizes=(16, 32, 256), repeat: int = 20) -> None:
+    """Time the previous per-pixel Python invert loop against each bulk transform, and all of them chained."""
+    import time
+
+    def invert_per_pixel(image: QImage) -> QImage:
+        # The loop invert_icon used before, kept here as the baseline
+        image = image.convertToFormat(QImage.Format.Format_ARGB32)
+        width, height = image.width(), image.height()
+        ptr = image.bits()
+        ptr.setsize(image.bytesPerLine() * image.height())
+        data = memoryview(ptr).cast("B")
+        for y in range(height):
+            for x in range(width):
+                pixel_index = (y * width + x) * 4
+                if data[pixel_index + 3] == 0:
+                    continue
+                data[pixel_index] = 255 - data[pixel_index]
+                data[pixel_index + 1] = 255 - data[pixel_index + 1]
+                data[pixel_index + 2] = 255 - data[pixel_index + 2]
+        return image
+
+    def measure(func, image: QImage) -> float:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func(image)
+        return (time.perf_counter() - start) / repeat * 1000
+
+    tint = tint_transform("#5a14b7")
+    transforms = (TRANSFORM_INVERTED, tint, TRANSFORM_DESATURATED, TRANSFORM_PREMULTIPLIED,
+                  TRANSFORM_SEPARATOR.join((tint, TRANSFORM_DESATURATED, TRANSFORM_PREMULTIPLIED)))
+    print(f"{'size':>6} {'transform':<35} {'bulk ms':>8} {'per-pixel invert ms':>20}")
+    for size in sizes:
+        image = QImage(size, size, QImage.Format.Format_ARGB32)
+        image.fill(QColor(30, 60, 90, 200))
+        per_pixel = measure(invert_per_pixel, image)
+        for transform in transforms:
+            bulk = measure(lambda source: transform_image(source, transform), image)
+            print(f"{size:>6} {transform:<35} {bulk:>8.3f} {per_pixel:>20.3f}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
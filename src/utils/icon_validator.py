@@ -0,0 +1,101 @@
+import logging
+import os
+import time
+from threading import Lock
+from typing import Callable, Dict, Optional, Tuple, Mapping, Any
+
+logger = logging.getLogger(__name__)
+
+# (mtime_ns, size, checked_at)
+StatEntry = Tuple[int, int, float]
+
+
+class IconPathValidator:
+    """
+    Checks that cached icon files exist, lazily and with cached stat results.
+
+    A path is stat'ed the first time it is used and then trusted for ttl seconds. After that
+    it is stat'ed again, and a changed mtime or size counts as a new file. Missing or empty
+    icons are reported through on_invalid (exe_name), once per path until it becomes valid.
+    """
+
+    def __init__(self,
+                 on_invalid: Optional[Callable[[str], None]] = None,
+                 ttl: float = 60.0,
+                 stat_func: Callable[[str], Any] = os.stat):
+        """
+        Args:
+            on_invalid: Called with the exe_name whose icon is missing, e.g. to re-extract it.
+            ttl: Seconds a successful stat is trusted.
+            stat_func: os.stat, replaceable to run without a filesystem.
+        """
+        self.on_invalid = on_invalid
+        self.ttl = ttl
+        self.stat_func = stat_func
+
+        self._stats: Dict[str, StatEntry] = {}
+        self._reported: Dict[str, str] = {}  # exe_name -> invalid path already reported
+        self._lock = Lock()
+
+        self.hits = 0
+        self.stats_done = 0
+        self.invalid = 0
+
+    def validate(self, exe_name: str, icon_path: str) -> str:
+        """Return icon_path if the file is usable, otherwise "" (and report the exe once)."""
+        if icon_path and self._is_valid(icon_path):
+            with self._lock:
+                self._reported.pop(exe_name, None)
+            return icon_path
+
+        with self._lock:
+            already_reported = self._reported.get(exe_name) == icon_path
+            self._reported[exe_name] = icon_path
+            self.invalid += 1
+        if not already_reported and self.on_invalid is not None:
+            logger.info(f"Icon for {exe_name} is missing ({icon_path or 'no path'}), re-extracting.")
+            self.on_invalid(exe_name)
+        return ""
+
+    def sweep(self, apps: Mapping[str, Mapping[str, str]]) -> int:
+        """Validate every cached entry, e.g. in the background after startup. Returns the number of invalid ones."""
+        invalid = 0
+        for exe_name, app_data in apps.items():
+            if not self.validate(exe_name, app_data.get("icon_path", "")):
+                invalid += 1
+        logger.debug(f"Icon sweep done: {invalid} of {len(apps)} icons invalid. {self.stats()}")
+        return invalid
+
+    def forget(self, icon_path: str) -> None:
+        """Drop the cached stat of a path, e.g. after the file was rewritten."""
+        with self._lock:
+            self._stats.pop(icon_path, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {"cached": len(self._stats), "hits": self.hits, "stats": self.stats_done, "invalid": self.invalid}
+
+    def _is_valid(self, icon_path: str) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._stats.get(icon_path)
+            if cached is not None and now - cached[2] < self.ttl:
+                self.hits += 1
+                return True
+
+        try:
+            result = self.stat_func(icon_path)
+        except OSError:
+            with self._lock:
+                self._stats.pop(icon_path, None)
+                self.stats_done += 1
+            return False
+
+        with self._lock:
+            self.stats_done += 1
+            if cached is not None and (cached[0], cached[1]) != (result.st_mtime_ns, result.st_size):
+                logger.debug(f"Icon file changed on disk: {icon_path}")
+            if result.st_size <= 0:
+                self._stats.pop(icon_path, None)
+                return False
+            self._stats[icon_path] = (result.st_mtime_ns, result.st_size, now)
+        return True
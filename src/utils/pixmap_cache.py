@@ -0,0 +1,85 @@
+import logging
+from collections import OrderedDict
+from typing import Callable, Dict, NamedTuple, Optional, Tuple, Any
+
+from PyQt6.QtGui import QPixmap
+
+logger = logging.getLogger(__name__)
+
+
+class PixmapKey(NamedTuple):
+    source: str  # File path or "atlas:<key>"
+    version: int  # mtime_ns of the file (or the atlas content version), so a changed icon is a new key
+    device_pixel_ratio: float
+    size: Optional[Tuple[int, int]]  # Logical target size, None for the original size
+    transform: str  # "" or e.g. "inverted"
+
+
+class PixmapCache:
+    """
+    LRU cache of ready-to-draw pixmaps with a memory budget, shared by everything that shows icons.
+
+    Entries are evicted least recently used first once the decoded size of all pixmaps exceeds
+    budget_bytes. Pixmaps belong to the GUI thread, so the cache is only used from there.
+    """
+
+    def __init__(self, budget_bytes: int):
+        self.budget_bytes = budget_bytes
+        self._entries: "OrderedDict[PixmapKey, Tuple[QPixmap, int]]" = OrderedDict()
+        self.used_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: PixmapKey) -> Optional[QPixmap]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: PixmapKey, pixmap: QPixmap) -> None:
+        cost = self.cost(pixmap)
+        if cost > self.budget_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.used_bytes -= previous[1]
+        self._entries[key] = (pixmap, cost)
+        self.used_bytes += cost
+        while self.used_bytes > self.budget_bytes:
+            _, (_, evicted_cost) = self._entries.popitem(last=False)
+            self.used_bytes -= evicted_cost
+            self.evictions += 1
+
+    def get_or_create(self, key: PixmapKey, factory: Callable[[], QPixmap]) -> QPixmap:
+        """Return the cached pixmap, or build, cache and return it. Null pixmaps are not cached."""
+        pixmap = self.get(key)
+        if pixmap is None:
+            pixmap = factory()
+            if not pixmap.isNull():
+                self.put(key, pixmap)
+        return pixmap
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.used_bytes = 0
+
+    @staticmethod
+    def cost(pixmap: QPixmap) -> int:
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "used_bytes": self.used_bytes,
+            "budget_bytes": self.budget_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "evictions": self.evictions,
+        }
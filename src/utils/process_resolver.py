@@ -0,0 +1,224 @@
+import ctypes
+import logging
+import os
+import sys
+from dataclasses import dataclass
+from threading import Lock
+from typing import Callable, Dict, Optional, Set, Tuple, Any
+
+logger = logging.getLogger(__name__)
+
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+SYNCHRONIZE = 0x00100000
+WAIT_OBJECT_0 = 0x00000000
+MAX_IMAGE_PATH = 32768
+
+
+@dataclass(frozen=True)
+class ProcessInfo:
+    pid: int
+    create_time: int
+    exe_path: str
+    exe_name: str
+    friendly_name: str
+
+    @property
+    def key(self) -> Tuple[int, int]:
+        return self.pid, self.create_time
+
+
+class Win32ProcessBackend:
+    """Queries processes with PROCESS_QUERY_LIMITED_INFORMATION, which also works for elevated processes."""
+
+    def __init__(self):
+        from ctypes import wintypes
+
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+
+        self._open_process = kernel32.OpenProcess
+        self._open_process.restype = wintypes.HANDLE
+        self._open_process.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+
+        self._query_image_name = kernel32.QueryFullProcessImageNameW
+        self._query_image_name.restype = wintypes.BOOL
+        self._query_image_name.argtypes = [wintypes.HANDLE, wintypes.DWORD, wintypes.LPWSTR, ctypes.POINTER(wintypes.DWORD)]
+
+        self._get_process_times = kernel32.GetProcessTimes
+        self._get_process_times.restype = wintypes.BOOL
+        self._get_process_times.argtypes = [wintypes.HANDLE] + [ctypes.POINTER(wintypes.FILETIME)] * 4
+
+        self._wait = kernel32.WaitForSingleObject
+        self._wait.restype = wintypes.DWORD
+        self._wait.argtypes = [wintypes.HANDLE, wintypes.DWORD]
+
+        self._close_handle = kernel32.CloseHandle
+        self._close_handle.argtypes = [wintypes.HANDLE]
+
+        self._wintypes = wintypes
+        self._path_buffer = ctypes.create_unicode_buffer(MAX_IMAGE_PATH)
+
+    def open(self, pid: int) -> Optional[Tuple[Any, int, str]]:
+        """Return (handle, create_time, exe_path) or None. The open handle keeps the PID from being reused."""
+        handle = self._open_process(PROCESS_QUERY_LIMITED_INFORMATION | SYNCHRONIZE, False, pid)
+        if not handle:
+            return None
+
+        create_time = self._read_create_time(handle)
+        size = self._wintypes.DWORD(MAX_IMAGE_PATH)
+        if create_time is None or not self._query_image_name(handle, 0, self._path_buffer, ctypes.byref(size)):
+            self._close_handle(handle)
+            return None
+        return handle, create_time, self._path_buffer.value
+
+    def get_create_time(self, pid: int) -> Optional[int]:
+        """Return the process creation time, or None if the process cannot be queried."""
+        handle = self._open_process(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return None
+        try:
+            return self._read_create_time(handle)
+        finally:
+            self._close_handle(handle)
+
+    def _read_create_time(self, handle: Any) -> Optional[int]:
+        wintypes = self._wintypes
+        creation, exit_time, kernel, user = (wintypes.FILETIME() for _ in range(4))
+        if not self._get_process_times(handle, ctypes.byref(creation), ctypes.byref(exit_time),
+                                       ctypes.byref(kernel), ctypes.byref(user)):
+            return None
+        return (creation.dwHighDateTime << 32) | creation.dwLowDateTime
+
+    def has_exited(self, handle: Any) -> bool:
+        return self._wait(handle, 0) == WAIT_OBJECT_0
+
+    def close(self, handle: Any) -> None:
+        self._close_handle(handle)
+
+
+class PsutilProcessBackend:
+    """Fallback for platforms without the Win32 API."""
+
+    def __init__(self):
+        import psutil
+        self._psutil = psutil
+
+    def open(self, pid: int) -> Optional[Tuple[Any, int, str]]:
+        try:
+            process = self._psutil.Process(pid)
+            return process, int(process.create_time() * 1000), process.exe()
+        except (self._psutil.NoSuchProcess, self._psutil.AccessDenied, self._psutil.ZombieProcess):
+            return None
+
+    def get_create_time(self, pid: int) -> Optional[int]:
+        try:
+            return int(self._psutil.Process(pid).create_time() * 1000)
+        except (self._psutil.NoSuchProcess, self._psutil.AccessDenied, self._psutil.ZombieProcess):
+            return None
+
+    def has_exited(self, handle: Any) -> bool:
+        # is_running() also compares the creation time, so a reused PID counts as exited
+        return not handle.is_running()
+
+    def close(self, handle: Any) -> None:
+        pass
+
+
+class ProcessResolver:
+    """
+    Resolves PIDs to executable info and caches it for the lifetime of each process.
+
+    Every cached process keeps an open handle, so its PID cannot be reused while the entry
+    exists and a cache hit needs no process query at all. sweep() evicts processes that
+    have exited. PIDs that could not be resolved are remembered by (pid, creation time) until
+    they stop showing up; each lookup re-reads only the creation time, so a reused PID is resolved again.
+    """
+
+    def __init__(self,
+                 friendly_name_func: Callable[[str, str], str],
+                 backend: Optional[Any] = None):
+        """
+        Args:
+            friendly_name_func: Returns the friendly app name for (exe_path, exe_name), called once per process.
+            backend: Process query backend, defaults to the Win32 one on Windows and psutil elsewhere.
+        """
+        if backend is None:
+            backend = Win32ProcessBackend() if sys.platform == "win32" else PsutilProcessBackend()
+        self.backend = backend
+        self.friendly_name_func = friendly_name_func
+
+        self._entries: Dict[int, Tuple[ProcessInfo, Any]] = {}
+        self._unresolvable: Dict[int, Optional[int]] = {}  # pid -> creation time, None if unreadable
+        self._seen_since_sweep: Set[int] = set()
+        self._lock = Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.queries = 0
+        self.failures = 0
+        self.rechecks = 0
+        self.evictions = 0
+
+    def resolve(self, pid: int) -> Optional[ProcessInfo]:
+        """Return the cached ProcessInfo for the PID, querying the process only on the first lookup."""
+        with self._lock:
+            self._seen_since_sweep.add(pid)
+            entry = self._entries.get(pid)
+            if entry is not None:
+                self.hits += 1
+                return entry[0]
+            if pid in self._unresolvable:
+                self.rechecks += 1
+                if self.backend.get_create_time(pid) == self._unresolvable[pid]:
+                    self.hits += 1
+                    return None
+                # The PID now belongs to a different process
+                del self._unresolvable[pid]
+
+            self.misses += 1
+            self.queries += 1
+            opened = self.backend.open(pid)
+            if opened is None or not os.path.exists(opened[2]):
+                if opened is not None:
+                    self.backend.close(opened[0])
+                self.failures += 1
+                self._unresolvable[pid] = self.backend.get_create_time(pid)
+                logger.warning(f"Could not resolve executable for PID {pid}")
+                return None
+
+            handle, create_time, exe_path = opened
+            exe_name = os.path.basename(exe_path).lower()
+            info = ProcessInfo(pid, create_time, exe_path, exe_name, self.friendly_name_func(exe_path, exe_name))
+            self._entries[pid] = (info, handle)
+            return info
+
+    def sweep(self) -> int:
+        """Evict exited processes and forget unresolvable PIDs not seen since the last sweep."""
+        with self._lock:
+            exited = [pid for pid, (_, handle) in self._entries.items() if self.backend.has_exited(handle)]
+            for pid in exited:
+                _, handle = self._entries.pop(pid)
+                self.backend.close(handle)
+            self._unresolvable = {pid: create_time for pid, create_time in self._unresolvable.items()
+                                  if pid in self._seen_since_sweep}
+            self._seen_since_sweep = set()
+            self.evictions += len(exited)
+            return len(exited)
+
+    def clear(self) -> None:
+        with self._lock:
+            for _, handle in self._entries.values():
+                self.backend.close(handle)
+            self._entries.clear()
+            self._unresolvable.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters; in steady state only hits, and rechecks of unresolvable PIDs, should grow."""
+        return {
+            "cached": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "queries": self.queries,
+            "failures": self.failures,
+            "rechecks": self.rechecks,
+            "evictions": self.evictions,
+        }
@@ -10,6 +10,8 @@ from PyQt6.QtCore import QCoreApplication, QPoint
 from PyQt6.QtGui import QCursor, QScreen, QGuiApplication
 from PyQt6.QtWidgets import QApplication, QWidget
 
+from src.data.app_info_store import AppInfoStore
+
 logger = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
@@ -20,6 +22,9 @@ def restart_program():
     current_pid = os.getpid()
     logger.info(f"Restarting. Current PID: {current_pid}")
 
+    # os._exit below skips atexit handlers, so pending cache writes are flushed here
+    AppInfoStore.flush_instance()
+
     if hasattr(sys, '_instance'):
         sys._instance.release_for_restart()
 
@@ -40,6 +45,7 @@ def restart_program():
 
 
 def quit_program():
+    AppInfoStore.flush_instance()
     QCoreApplication.exit()
 
 
@@ -0,0 +1,208 @@
+import json
+import logging
+import os
+import struct
+import time
+from threading import Lock
+from typing import Dict, Optional, Tuple, Any, List
+
+from src.data.config import CONFIG
+from src.utils.file_handling_utils import get_resource_path
+
+logger = logging.getLogger(__name__)
+
+# Icon paths of the form "res:<relative asset path>" are served from the resource pack
+RESOURCE_PREFIX = "res:"
+# Suffix of the pre-inverted variant of an icon in the pack
+INVERTED_SUFFIX = "#inverted"
+
+_MAGIC = b"MPRES001"
+# magic, offset of the index, length of the index
+_HEADER = struct.Struct("<8sQQ")
+
+# What build_resource_pack() packs, relative to the program directory
+PACKED_ASSET_DIRS = ("assets/external_icons", "assets/graphic_elements")
+PACKED_ASSET_FILES = ("assets/style.qss",)
+# Built-in icons are black and mostly drawn inverted on the dark menus
+INVERTED_ASSET_DIRS = ("assets/external_icons",)
+
+
+def resource_key(icon_path: str) -> Optional[str]:
+    """Return the asset path of a "res:<path>" icon path, or None for anything else."""
+    return icon_path[len(RESOURCE_PREFIX):] if icon_path and icon_path.startswith(RESOURCE_PREFIX) else None
+
+
+class ResourcePack:
+    """
+    The built-in assets (icons, SVGs, the QSS template) packed into one indexed file.
+
+    The pack is read with a single file open at startup, and everything is served from memory
+    afterwards. It is generated with `python -m src.utils.resource_pack` before building; if it
+    is missing, every lookup falls back to the loose files in assets/, so running from source
+    works without it. stats() tells how many file opens were avoided and what loading cost.
+    """
+
+    _instance = None
+    _instance_lock = Lock()
+
+    def __init__(self, path: str):
+        self.path = path
+        self._data = b""
+        self._index: Dict[str, Tuple[int, int]] = {}
+
+        self.load_ms = 0.0
+        self.served: set = set()
+        self.fallback_reads = 0
+        self.fallback_ms = 0.0
+
+        start = time.perf_counter()
+        try:
+            with open(path, "rb") as f:
+                self._data = f.read()
+            magic, index_offset, index_length = _HEADER.unpack_from(self._data)
+            if magic != _MAGIC:
+                raise ValueError("not a resource pack")
+            index = json.loads(self._data[index_offset:index_offset + index_length])
+            self._index = {name: (entry[0], entry[1]) for name, entry in index.items()}
+        except FileNotFoundError:
+            logger.info(f"No resource pack at {path}, loading assets from individual files.")
+        except (OSError, ValueError, struct.error) as e:
+            logger.error(f"Resource pack {path} is unreadable, loading assets from individual files: {e}")
+            self._data, self._index = b"", {}
+        self.load_ms = (time.perf_counter() - start) * 1000
+
+    @staticmethod
+    def get_instance() -> "ResourcePack":
+        if ResourcePack._instance is None:
+            with ResourcePack._instance_lock:
+                if ResourcePack._instance is None:
+                    ResourcePack._instance = ResourcePack(get_resource_path(CONFIG.INTERNAL_RESOURCE_PACK_PATH))
+        return ResourcePack._instance
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def path_for(self, relative_path: str) -> str:
+        """The icon path to use for a built-in asset: "res:<path>" if it is packed, else the file path."""
+        if relative_path in self._index:
+            return f"{RESOURCE_PREFIX}{relative_path}"
+        return get_resource_path(relative_path)
+
+    def read(self, relative_path: str) -> Optional[bytes]:
+        """Return the asset's bytes from the pack, or from its file if it is not packed."""
+        entry = self._index.get(relative_path)
+        if entry is not None:
+            self.served.add(relative_path)
+            offset, length = entry
+            return self._data[offset:offset + length]
+
+        start = time.perf_counter()
+        try:
+            with open(get_resource_path(relative_path), "rb") as f:
+                return f.read()
+        except OSError as e:
+            logger.error(f"Could not read asset {relative_path}: {e}")
+            return None
+        finally:
+            self.fallback_reads += 1
+            self.fallback_ms += (time.perf_counter() - start) * 1000
+
+    def read_text(self, relative_path: str) -> str:
+        data = self.read(relative_path)
+        return data.decode("utf-8") if data is not None else ""
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "packed": len(self._index),
+            "load_ms": round(self.load_ms, 2),
+            "file_opens_saved": max(len(self.served) - 1, 0),
+            "fallback_reads": self.fallback_reads,
+            "fallback_ms": round(self.fallback_ms, 2),
+        }
+
+
+def _collect_assets(root: str) -> List[str]:
+    names = list(PACKED_ASSET_FILES)
+    for asset_dir in PACKED_ASSET_DIRS:
+        for filename in sorted(os.listdir(os.path.join(root, asset_dir))):
+            if os.path.isfile(os.path.join(root, asset_dir, filename)):
+                names.append(f"{asset_dir}/{filename}")
+    return names
+
+
+def build_resource_pack(root: str = ".", output: Optional[str] = None) -> Dict[str, int]:
+    """
+    Pack the built-in assets, plus pre-inverted variants of the icons, into one file.
+
+    The inverted variants are rendered with Qt (the same transform the menus apply at runtime).
+
+    Returns:
+        {"entries": ..., "bytes": ...} of the written pack.
+    """
+    from PyQt6.QtGui import QImage
+
+    from src.utils.hicon_utils import encode_png
+    from src.utils.icon_utils import transform_image, TRANSFORM_INVERTED
+
+    output = output or os.path.join(root, CONFIG.INTERNAL_RESOURCE_PACK_PATH)
+    entries: Dict[str, bytes] = {}
+    for name in _collect_assets(root):
+        with open(os.path.join(root, name), "rb") as f:
+            entries[name] = f.read()
+        if name.endswith(".png") and name.rsplit("/", 1)[0] in INVERTED_ASSET_DIRS:
+            inverted = encode_png(transform_image(QImage.fromData(entries[name], "PNG"), TRANSFORM_INVERTED))
+            if inverted is not None:
+                entries[f"{name}{INVERTED_SUFFIX}"] = inverted
+
+    data = bytearray(_HEADER.size)
+    index: Dict[str, List[int]] = {}
+    for name, content in entries.items():
+        index[name] = [len(data), len(content)]
+        data += content
+    index_offset = len(data)
+    encoded_index = json.dumps(index, separators=(",", ":")).encode()
+    data += encoded_index
+    data[0:_HEADER.size] = _HEADER.pack(_MAGIC, index_offset, len(encoded_index))
+
+    with open(output, "wb") as f:
+        f.write(data)
+    logger.info(f"Wrote {len(entries)} assets ({len(data)} bytes) to {output}")
+    return {"entries": len(entries), "bytes": len(data)}
+
+
+def run_benchmark(root: str = ".", repeat: int = 20) -> None:
+    """Compare reading every packed asset from its own file against loading the pack once."""
+    pack_path = os.path.join(root, CONFIG.INTERNAL_RESOURCE_PACK_PATH)
+    if not os.path.exists(pack_path):
+        print(f"{pack_path} does not exist, build it first with: python -m src.utils.resource_pack")
+        return
+    names = _collect_assets(root)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for name in names:
+            with open(os.path.join(root, name), "rb") as f:
+                f.read()
+    files_ms = (time.perf_counter() - start) / repeat * 1000
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        pack = ResourcePack(pack_path)
+        for name in names:
+            pack.read(name)
+    pack_ms = (time.perf_counter() - start) / repeat * 1000
+
+    print(f"{'assets':>7} {'file opens':>11} {'files ms':>9} {'pack opens':>11} {'pack ms':>8}")
+    print(f"{len(names):>7} {len(names):>11} {files_ms:>9.3f} {1:>11} {pack_ms:>8.3f}")
+
+
+if __name__ == "__main__":
+    import sys
+
+    if sys.argv[1:] == ["benchmark"]:
+        run_benchmark()
+    else:
+        from PyQt6.QtGui import QGuiApplication
+
+        app = QGuiApplication(sys.argv[:1])
+        print(build_resource_pack())
@@ -0,0 +1,108 @@
+import logging
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Markers that apply regardless of the app info cache, checked before the app name
+DEFAULT_SUFFIXES: Dict[str, Tuple[str, ...]] = {
+    "explorer.exe": (" - File Explorer",),
+}
+DEFAULT_PREFIXES: Dict[str, Tuple[str, ...]] = {}
+
+
+class TitleNormalizer:
+    """
+    Strips app-specific decoration such as " - Google Chrome" from window titles.
+
+    Suffix and prefix tables are kept per exe and filled from the app info cache. Results
+    are memoized per (exe_name, raw title) in a bounded LRU, so windows that retitle
+    constantly only cost a dict lookup once a title has been seen. No Win32 involved.
+    """
+
+    def __init__(self,
+                 max_entries: int = 2048,
+                 suffixes: Optional[Mapping[str, Iterable[str]]] = None,
+                 prefixes: Optional[Mapping[str, Iterable[str]]] = None):
+        """
+        Args:
+            max_entries: Size of the memo; the least recently used titles are dropped first.
+            suffixes: Fixed suffix markers per exe, defaults to DEFAULT_SUFFIXES.
+            prefixes: Fixed prefix markers per exe, defaults to DEFAULT_PREFIXES.
+        """
+        self.max_entries = max_entries
+        self._fixed_suffixes = {exe: tuple(markers) for exe, markers in (suffixes or DEFAULT_SUFFIXES).items()}
+        self._fixed_prefixes = {exe: tuple(markers) for exe, markers in (prefixes or DEFAULT_PREFIXES).items()}
+        self._app_names: Dict[str, str] = {}
+        self._suffixes: Dict[str, Tuple[str, ...]] = dict(self._fixed_suffixes)
+        self._prefixes: Dict[str, Tuple[str, ...]] = dict(self._fixed_prefixes)
+        self._memo: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._lock = Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def load_app_names(self, app_cache: Mapping[str, dict]) -> None:
+        """Rebuild the tables from the app info cache (exe_name -> {"app_name": ...})."""
+        with self._lock:
+            self._app_names = {exe_name: data["app_name"] for exe_name, data in app_cache.items()
+                               if data.get("app_name")}
+            self._suffixes = dict(self._fixed_suffixes)
+            for exe_name in self._app_names:
+                self._suffixes[exe_name] = self._compile_suffixes(exe_name)
+            self._memo.clear()
+
+    def set_app_name(self, exe_name: str, app_name: str) -> None:
+        """Add or update the app name of one exe; a no-op if it is unchanged."""
+        if not app_name or self._app_names.get(exe_name) == app_name:
+            return
+        with self._lock:
+            self._app_names[exe_name] = app_name
+            self._suffixes[exe_name] = self._compile_suffixes(exe_name)
+            self._drop_memo_for(exe_name)
+
+    def normalize(self, exe_name: str, title: str) -> str:
+        key = (exe_name, title)
+        with self._lock:
+            clean_title = self._memo.get(key)
+            if clean_title is not None:
+                self._memo.move_to_end(key)
+                self.hits += 1
+                return clean_title
+
+            self.misses += 1
+            clean_title = self._strip(exe_name, title)
+            self._memo[key] = clean_title
+            if len(self._memo) > self.max_entries:
+                self._memo.popitem(last=False)
+            return clean_title
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memo.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"cached": len(self._memo), "hits": self.hits, "misses": self.misses}
+
+    def _compile_suffixes(self, exe_name: str) -> Tuple[str, ...]:
+        # Fixed markers take precedence, e.g. explorer.exe's " - File Explorer" over its app name
+        return self._fixed_suffixes.get(exe_name, ()) + (f" - {self._app_names[exe_name]}",)
+
+    def _strip(self, exe_name: str, title: str) -> str:
+        # Only the first matching marker is removed
+        for prefix in self._prefixes.get(exe_name, ()):
+            if title.startswith(prefix):
+                return title[len(prefix):]
+        for suffix in self._suffixes.get(exe_name, ()):
+            if title.endswith(suffix):
+                return title[:-len(suffix)]
+            if suffix in title:
+                # e.g. "file.txt - Notepad++ [Administrator]"
+                return title.replace(suffix, "")
+        return title
+
+    def _drop_memo_for(self, exe_name: str) -> None:
+        stale = [key for key in self._memo if key[0] == exe_name]
+        for key in stale:
+            del self._memo[key]
@@ -0,0 +1,299 @@
+import logging
+import re
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple, Any
+
+logger = logging.getLogger(__name__)
+
+# Extended window styles (winuser.h)
+WS_EX_TOOLWINDOW = 0x00000080
+WS_EX_APPWINDOW = 0x00040000
+
+
+class WindowProbe:
+    """Reads the attributes of one window lazily, so a rule only pays for what it looks at."""
+
+    __slots__ = ("backend", "exe_name_func", "hwnd", "_class_name", "_title", "_ex_style", "_owner", "_exe_name")
+
+    def __init__(self, backend: Any, exe_name_func: Optional[Callable[[int], str]] = None):
+        self.backend = backend
+        self.exe_name_func = exe_name_func
+        self.reset(0)
+
+    def reset(self, hwnd: int) -> None:
+        self.hwnd = hwnd
+        self._class_name = None
+        self._title = None
+        self._ex_style = None
+        self._owner = None
+        self._exe_name = None
+
+    @property
+    def class_name(self) -> str:
+        if self._class_name is None:
+            self._class_name = self.backend.get_class_name(self.hwnd)
+        return self._class_name
+
+    @property
+    def title(self) -> str:
+        if self._title is None:
+            self._title = self.backend.get_title(self.hwnd)
+        return self._title
+
+    @property
+    def ex_style(self) -> int:
+        if self._ex_style is None:
+            self._ex_style = self.backend.get_ex_style(self.hwnd)
+        return self._ex_style
+
+    @property
+    def owner(self) -> int:
+        if self._owner is None:
+            self._owner = self.backend.get_owner(self.hwnd)
+        return self._owner
+
+    @property
+    def exe_name(self) -> str:
+        if self._exe_name is None:
+            self._exe_name = self.exe_name_func(self.hwnd) if self.exe_name_func else ""
+        return self._exe_name
+
+
+class WindowRule:
+    """A single exclusion check. Lower cost runs earlier; the pipeline stops at the first rejection."""
+
+    name = "rule"
+    cost = 0
+
+    def __init__(self):
+        self.evaluated = 0
+        self.rejected = 0
+        self.time_ns = 0
+
+    def rejects(self, probe: WindowProbe) -> bool:
+        raise NotImplementedError
+
+    def reset_stats(self) -> None:
+        self.evaluated = 0
+        self.rejected = 0
+        self.time_ns = 0
+
+
+class ExcludedHwndRule(WindowRule):
+    """Rejects explicitly excluded windows, e.g. the program's own. The set is live, so later additions apply."""
+    name = "excluded_hwnd"
+    cost = 0
+
+    def __init__(self, hwnds: Set[int]):
+        super().__init__()
+        self.hwnds = hwnds
+
+    def rejects(self, probe: WindowProbe) -> bool:
+        return probe.hwnd in self.hwnds
+
+
+class VisibleRule(WindowRule):
+    name = "visible"
+    cost = 1
+
+    def rejects(self, probe: WindowProbe) -> bool:
+        return not probe.backend.is_visible(probe.hwnd)
+
+
+class AltTabRule(WindowRule):
+    """Mirrors Alt+Tab: tool windows and owned windows are skipped unless they have WS_EX_APPWINDOW."""
+    name = "alt_tab"
+    cost = 2
+
+    def rejects(self, probe: WindowProbe) -> bool:
+        ex_style = probe.ex_style
+        if ex_style & WS_EX_APPWINDOW:
+            return False
+        return bool(ex_style & WS_EX_TOOLWINDOW) or bool(probe.owner)
+
+
+class CloakedRule(WindowRule):
+    """Rejects windows hidden by DWM, e.g. UWP apps that are suspended or on another virtual desktop."""
+    name = "cloaked"
+    cost = 3
+
+    def rejects(self, probe: WindowProbe) -> bool:
+        return probe.backend.is_cloaked(probe.hwnd)
+
+
+class ClassNameRule(WindowRule):
+    name = "class_name"
+    cost = 4
+
+    def __init__(self, class_names: Iterable[str]):
+        super().__init__()
+        self.class_names = frozenset(class_names)
+
+    def rejects(self, probe: WindowProbe) -> bool:
+        return probe.class_name in self.class_names
+
+
+class EmptyTitleRule(WindowRule):
+    name = "empty_title"
+    cost = 5
+
+    def rejects(self, probe: WindowProbe) -> bool:
+        return not probe.title.strip()
+
+
+class TitleRegexRule(WindowRule):
+    """All patterns are compiled into one alternation, so a title is matched once."""
+    name = "title_regex"
+    cost = 6
+
+    def __init__(self, patterns: Iterable[str]):
+        super().__init__()
+        valid = []
+        for pattern in patterns:
+            try:
+                re.compile(pattern)
+                valid.append(f"(?:{pattern})")
+            except re.error as e:
+                logger.error(f"Ignoring invalid title pattern {pattern!r}: {e}")
+        self.regex = re.compile("|".join(valid)) if valid else None
+
+    def rejects(self, probe: WindowProbe) -> bool:
+        return self.regex is not None and self.regex.search(probe.title) is not None
+
+
+class ExeNameRule(WindowRule):
+    """Needs the owning process, so it runs last."""
+    name = "exe_name"
+    cost = 10
+
+    def __init__(self, exe_names: Iterable[str]):
+        super().__init__()
+        self.exe_names = frozenset(name.lower() for name in exe_names)
+
+    def rejects(self, probe: WindowProbe) -> bool:
+        return probe.exe_name in self.exe_names
+
+
+class WindowFilterPipeline:
+    """Runs the rules cheapest-first and stops at the first rejection.
+
+    With profile set, hits and time are counted per rule; otherwise nothing is counted.
+    """
+
+    def __init__(self,
+                 rules: Iterable[WindowRule],
+                 exe_name_func: Optional[Callable[[int], str]] = None,
+                 profile: bool = False):
+        """
+        Args:
+            rules: The rules to apply, in any order; they are sorted by cost.
+            exe_name_func: Returns the exe name for a window, only needed by ExeNameRule.
+            profile: Count hits and measure the time spent in each rule, which costs two clock reads per check.
+        """
+        self.rules: List[WindowRule] = sorted(rules, key=lambda rule: rule.cost)
+        self._compile()
+        self.exe_name_func = exe_name_func
+        self.profile = profile
+        self._probe: Optional[WindowProbe] = None
+        self.evaluated = 0
+        self.accepted = 0
+
+    def _compile(self) -> None:
+        """Inline the leading hwnd and visibility rules, so most windows are rejected without a probe or rule call."""
+        self._excluded_hwnds: Set[int] = frozenset()
+        self._check_visible = False
+        inlined = 0
+        for rule in self.rules:
+            if isinstance(rule, ExcludedHwndRule) and not self._excluded_hwnds:
+                self._excluded_hwnds = rule.hwnds
+            elif isinstance(rule, VisibleRule) and not self._check_visible:
+                self._check_visible = True
+            else:
+                break
+            inlined += 1
+        self._checks = [rule.rejects for rule in self.rules[inlined:]]
+
+    def evaluate(self, backend: Any, hwnd: int) -> Optional[Tuple[str, str]]:
+        """Return (class_name, title) if the window passes every rule, or None."""
+        probe = self._probe
+        if probe is None or probe.backend is not backend:
+            probe = self._probe = WindowProbe(backend, self.exe_name_func)
+
+        if not self.profile:
+            if hwnd in self._excluded_hwnds or (self._check_visible and not backend.is_visible(hwnd)):
+                return None
+            probe.reset(hwnd)
+            for rejects in self._checks:
+                if rejects(probe):
+                    return None
+            return probe.class_name, probe.title
+
+        probe.reset(hwnd)
+        self.evaluated += 1
+        perf_counter_ns = time.perf_counter_ns
+        for rule in self.rules:
+            start = perf_counter_ns()
+            rejected = rule.rejects(probe)
+            rule.time_ns += perf_counter_ns() - start
+            rule.evaluated += 1
+            if rejected:
+                rule.rejected += 1
+                return None
+        self.accepted += 1
+        return probe.class_name, probe.title
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-rule counters in evaluation order, collected while profiling; 'rejected' is how many windows the rule filtered out."""
+        return [
+            {
+                "rule": rule.name,
+                "evaluated": rule.evaluated,
+                "rejected": rule.rejected,
+                "time_us": round(rule.time_ns / 1000, 1),
+            }
+            for rule in self.rules
+        ]
+
+    def reset_stats(self) -> None:
+        self.evaluated = 0
+        self.accepted = 0
+        for rule in self.rules:
+            rule.reset_stats()
+
+
+def build_window_filter(excluded_hwnds: Set[int],
+                        excluded_class_names: Iterable[str] = (),
+                        excluded_exe_names: Iterable[str] = (),
+                        excluded_title_patterns: Iterable[str] = (),
+                        alt_tab_semantics: bool = False,
+                        exe_name_func: Optional[Callable[[int], str]] = None,
+                        profile: bool = False) -> WindowFilterPipeline:
+    """Compile the exclusion settings into a pipeline, leaving out rules that have nothing to check."""
+    rules: List[WindowRule] = [ExcludedHwndRule(excluded_hwnds), VisibleRule(), CloakedRule(), EmptyTitleRule()]
+    if alt_tab_semantics:
+        rules.append(AltTabRule())
+    if excluded_class_names:
+        rules.append(ClassNameRule(excluded_class_names))
+    if excluded_title_patterns:
+        rules.append(TitleRegexRule(excluded_title_patterns))
+    if excluded_exe_names:
+        if exe_name_func is None:
+            logger.warning("Excluded exe names are configured, but no exe lookup is available; ignoring them.")
+        else:
+            rules.append(ExeNameRule(excluded_exe_names))
+    return WindowFilterPipeline(rules, exe_name_func, profile)
+
+
+def build_window_filter_from_config(config: Any,
+                                    excluded_hwnds: Set[int],
+                                    exe_name_func: Optional[Callable[[int], str]] = None) -> WindowFilterPipeline:
+    """Build the pipeline from the INTERNAL_WINDOW_FILTER_* settings."""
+    return build_window_filter(
+        excluded_hwnds,
+        excluded_class_names=config.INTERNAL_WINDOW_FILTER_CLASS_NAMES,
+        excluded_exe_names=config.INTERNAL_WINDOW_FILTER_EXE_NAMES,
+        excluded_title_patterns=config.INTERNAL_WINDOW_FILTER_TITLE_PATTERNS,
+        alt_tab_semantics=config.INTERNAL_WINDOW_FILTER_ALT_TAB,
+        exe_name_func=exe_name_func,
+        profile=config.INTERNAL_WINDOW_FILTER_PROFILE,
+    )
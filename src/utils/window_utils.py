@@ -1,49 +1,51 @@
 # window_utils.py
 
-import ctypes
 import logging
 import os
 import sys
-from ctypes import windll
-from typing import Dict, Tuple, Optional, TypeAlias, Any
+import ctypes
+from ctypes import windll, wintypes
+import threading
+import time
+from threading import Lock
+from typing import Dict, Tuple, Optional, TypeAlias, Set, Callable, Mapping
 
-import psutil
 import pythoncom
 import win32api
 import win32con
 import win32gui
 import win32process
-import win32ui
-from PIL import Image
 from PyQt6.QtWidgets import QWidget, QMessageBox
 
+from src.data.app_info_store import AppInfoStore
 from src.data.config import CONFIG
+from src.data.icon_atlas import IconAtlas, atlas_icon_path, atlas_key
 from src.data.window_manager import WindowManager
-from src.utils.json_utils import JSONManager
+from src.data.window_snapshot_store import WindowDiff
+from src.helper.icon_service import IconService
+from src.utils.app_name_resolver import AppNameResolver, placeholder_app_name
+from src.utils.hicon_utils import HiconRenderer
+from src.utils.icon_validator import IconPathValidator
+from src.utils.process_resolver import ProcessResolver
+from src.utils.title_normalizer import TitleNormalizer
+from src.utils.window_enumeration import Win32EnumBackend, WindowBatch, collect_windows
+from src.utils.window_filters import build_window_filter_from_config
 
 logger = logging.getLogger(__name__)
 
-cache_being_cleared = False
-
-APP_NAME = CONFIG.INTERNAL_PROGRAM_NAME
-CACHE_FILENAME = CONFIG.INTERNAL_CACHE_FILENAME
-
-
-def load_cache():
-    """Load application name cache from file."""
-    return JSONManager.load(APP_NAME, CACHE_FILENAME, default={})
+APP_ICONS_FOLDER = "app_icons"
+# Icon files younger than this are never treated as orphaned, their cache entry may not be written yet
+ORPHANED_ICON_GRACE_PERIOD = 3600
 
-
-def save_cache(cache):
-    """Save application name cache to file."""
-    if JSONManager.save(APP_NAME, CACHE_FILENAME, cache):
-        logger.info("Cache saved successfully.")
-    else:
-        logger.error("Error saving cache file.")
+# The single, thread-safe app info cache; read through snapshots, written through upserts
+app_info_store = AppInfoStore.get_instance()
+icon_atlas = IconAtlas.get_instance()
+# One HiconRenderer per icon-extracting thread
+_icon_renderers = threading.local()
 
 
 def clear_cache(self):
-    """Clear the cache by deleting the cache file."""
+    """Clear the app info cache and the extracted icons."""
     reply = QMessageBox.question(
         self, "Reset Confirmation",
         "Are you sure you want to reset le Cache?",
@@ -51,21 +53,12 @@ def clear_cache(self):
     )
 
     if reply == QMessageBox.StandardButton.Yes:
-        global cache_being_cleared
-        cache_being_cleared = True
-
-        cache_dir = JSONManager.get_config_directory(APP_NAME, config_type='cache')
-        cache_file = os.path.join(cache_dir, CACHE_FILENAME)
-        logger.debug(cache_file)
-
-        if os.path.exists(cache_file):
-            try:
-                os.remove(cache_file)
-                logger.info("Cache file cleared successfully.")
-            except Exception as e:
-                logger.error(f"Error clearing cache file: {e}")
-        else:
-            logger.warning("Cache file does not exist.")
+        try:
+            app_info_store.clear()
+            icon_atlas.clear()
+            logger.info("Cache cleared successfully.")
+        except Exception as e:
+            logger.error(f"Error clearing cache: {e}")
 
         # Determine the program directory
         if hasattr(sys, '_MEIPASS'):  # Running as a compiled executable
@@ -90,19 +83,54 @@ def clear_cache(self):
         else:
             logger.error("Icons folder does not exist.")  # For debugging purposes
 
-        global app_cache
-        app_cache = load_cache()
-        cache_being_cleared = False
+        title_normalizer.load_app_names(app_info_store.snapshot().apps)
 
 
-app_cache = load_cache()
+title_normalizer = TitleNormalizer()
+title_normalizer.load_app_names(app_info_store.snapshot().apps)
 
 manager = WindowManager.get_instance()
 
-# List to store HWNDs to exclude
-hwnds_to_exclude = []
-EXCLUDED_CLASS_NAMES = {"Progman", "AutoHotkeyGUI", "RainmeterMeterWindow"}
-DWM_WINDOW_CLOAKED_STATE = 14
+
+def _apply_resolved_app_name(exe_name: str, app_name: str) -> None:
+    """Upgrade the placeholder name of a cached app once its FileDescription was read."""
+    if app_info_store.snapshot().get(exe_name, "app_name") == app_name:
+        return
+    if app_info_store.update(exe_name, app_name=app_name):
+        title_normalizer.set_app_name(exe_name, app_name)
+        if app_info_updated_callback is not None:
+            app_info_updated_callback(exe_name)
+
+
+# Version resources are read on worker threads; enumeration only ever sees memoized names or placeholders
+app_name_resolver = AppNameResolver(
+    lookup_func=lambda exe_path, exe_name: _get_friendly_app_name(exe_path, exe_name),
+    on_resolved=_apply_resolved_app_name
+)
+
+process_resolver = ProcessResolver(
+    friendly_name_func=lambda exe_path, exe_name: app_name_resolver.resolve(
+        exe_path, exe_name, placeholder=app_info_store.snapshot().get(exe_name, "app_name")
+    )
+)
+
+# Set of HWNDs to exclude
+hwnds_to_exclude: Set[int] = set()
+
+# Entry points are bound once and the batch is reused across scans
+enum_backend = Win32EnumBackend()
+window_batch = WindowBatch()
+# The backend buffers and the batch are shared between the scan and the window event thread
+enumeration_lock = Lock()
+
+
+def _get_exe_name_for_filter(hwnd: int) -> str:
+    pid = _get_pid_from_window_handle(hwnd)
+    process_info = process_resolver.resolve(pid) if pid else None
+    return process_info.exe_name if process_info is not None else ""
+
+
+window_filter = build_window_filter_from_config(CONFIG, hwnds_to_exclude, exe_name_func=_get_exe_name_for_filter)
 
 # Custom type aliases
 WindowInfo: TypeAlias = Tuple[str, str, int]  # (title, exe_name, instance)
@@ -110,15 +138,159 @@ WindowMapping: TypeAlias = Dict[int, WindowInfo]
 
 
 def update_icon_paths_in_cache():
-    """Update the cache by removing entries with invalid or missing icon paths."""
-    invalid_entries = [exe_name for exe_name, app_data in app_cache.items()
-                       if not app_data.get('icon_path') or not os.path.exists(app_data['icon_path'])]
+    """Validate all cached icon paths in a background thread; missing icons are re-extracted, not deleted."""
+    threading.Thread(
+        target=lambda: icon_validator.sweep(app_info_store.snapshot().apps),
+        daemon=True,
+        name="IconSweepThread"
+    ).start()
+
+
+def maintain_app_cache(button_config: Dict[int, Dict]) -> None:
+    """Evict old app info entries and delete icon files nothing refers to, in a background thread.
+
+    Exes and icons used by the given button config are never removed.
+    """
+    # Read on the calling (GUI) thread, the button config is not shared with the worker
+    protected_exe_names = {button['properties'].get('exe_name', '') for button in button_config.values()
+                           if button.get('task_type') in ("show_program_window", "launch_program")}
+    button_icon_paths = {button['properties'].get('app_icon_path', '') for button in button_config.values()}
+    threading.Thread(
+        target=_maintain_app_cache,
+        args=(protected_exe_names, button_icon_paths),
+        daemon=True,
+        name="AppCacheMaintenanceThread"
+    ).start()
+
+
+def _maintain_app_cache(protected_exe_names: Set[str], button_icon_paths: Set[str]) -> None:
+    try:
+        app_info_store.evict(CONFIG.INTERNAL_CACHE_MAX_ENTRIES, CONFIG.INTERNAL_CACHE_MAX_AGE_DAYS * 86400,
+                             protected_exe_names)
+        _import_legacy_icon_files()
+        _collect_orphaned_atlas_icons(button_icon_paths)
+        _collect_orphaned_icons(button_icon_paths)
+    except Exception as e:
+        logger.error(f"Error maintaining app info cache: {e}")
+
+
+def _import_legacy_icon_files() -> int:
+    """Move icons that are still separate PNG files into the atlas; the files are then orphaned and deleted."""
+    imported = 0
+    for exe_name, record in app_info_store.snapshot().apps.items():
+        icon_path = record["icon_path"]
+        if not icon_path or atlas_key(icon_path) is not None or not os.path.isfile(icon_path):
+            continue
+        with open(icon_path, "rb") as f:
+            icon_atlas.replace(exe_name, f.read())
+        app_info_store.update(exe_name, icon_path=atlas_icon_path(exe_name))
+        imported += 1
+    if imported:
+        logger.info(f"Imported {imported} icon files into the icon atlas.")
+    return imported
+
+
+def _collect_orphaned_atlas_icons(keep_paths: Set[str]) -> int:
+    """Remove atlas icons no cache entry or button refers to, then compact the atlas if anything was removed."""
+    referenced = {atlas_key(path) for path in keep_paths}
+    referenced.update(atlas_key(record["icon_path"]) for record in app_info_store.snapshot().apps.values())
+    # Icons being extracted are in the atlas before their cache entry points at them
+    orphaned = [key for key in icon_atlas.keys() if key not in referenced and not icon_service.is_pending(key)]
+    removed = icon_atlas.remove(orphaned)
+    if removed:
+        icon_atlas.compact()
+        logger.info(f"Removed {removed} orphaned icons from the icon atlas.")
+    return removed
+
+
+def _collect_orphaned_icons(keep_paths: Set[str]) -> int:
+    """Delete icon files no cache entry or button refers to. Returns the number of deleted files."""
+    if not os.path.isdir(APP_ICONS_FOLDER):
+        return 0
+    # List first, so icons extracted while this runs are not in the listing; recent files are kept too
+    filenames = os.listdir(APP_ICONS_FOLDER)
+    referenced = {os.path.normcase(os.path.abspath(path)) for path in keep_paths if path}
+    referenced.update(os.path.normcase(os.path.abspath(record["icon_path"]))
+                      for record in app_info_store.snapshot().apps.values() if record["icon_path"])
+
+    cutoff = time.time() - ORPHANED_ICON_GRACE_PERIOD
+    deleted = 0
+    for filename in filenames:
+        path = os.path.join(APP_ICONS_FOLDER, filename)
+        try:
+            if (os.path.normcase(os.path.abspath(path)) in referenced
+                    or not os.path.isfile(path) or os.path.getmtime(path) > cutoff):
+                continue
+            os.remove(path)
+            icon_validator.forget(path)
+            deleted += 1
+        except OSError as e:
+            logger.warning(f"Could not remove orphaned icon {path}: {e}")
+    if deleted:
+        logger.info(f"Removed {deleted} orphaned icons from {APP_ICONS_FOLDER}.")
+    return deleted
+
+
+def validate_icon_path(exe_name: str, icon_path: str) -> str:
+    """Return the icon path if the file is usable, otherwise "" while the icon is re-extracted in the background."""
+    return icon_validator.validate(exe_name, icon_path)
+
+
+def set_app_info_updated_callback(callback: Optional[Callable[[str], None]]) -> None:
+    """Register a function called with the exe_name after its app name was resolved."""
+    global app_info_updated_callback
+    app_info_updated_callback = callback
+
+
+def _schedule_icon_reextraction(exe_name: str) -> None:
+    exe_path = app_info_store.snapshot().get(exe_name, "exe_path")
+    if not exe_path:
+        logger.warning(f"Cannot re-extract icon for {exe_name}: executable path unknown.")
+        return
+    icon_service.request(exe_name, exe_path)
+
+
+def _store_extracted_icon(exe_name: str, icon_path: str) -> None:
+    icon_validator.forget(icon_path)
+    app_info_store.update(exe_name, icon_path=icon_path)
+
 
-    for exe_name in invalid_entries:
-        del app_cache[exe_name]
-        logger.warning(f"Removed entry for {exe_name} due to invalid or missing icon path.")
+def _init_icon_worker() -> None:
+    # Once per worker thread instead of once per extracted icon
+    pythoncom.CoInitialize()
+    _icon_renderer()
 
-    save_cache(app_cache)
+
+def _exit_icon_worker() -> None:
+    _close_icon_renderer()
+    pythoncom.CoUninitialize()
+
+
+def _stat_icon_path(icon_path: str):
+    """os.stat for icon files; atlas icons are looked up in the atlas index instead."""
+    key = atlas_key(icon_path)
+    if key is None:
+        return os.stat(icon_path)
+    entry = icon_atlas.stat(key)
+    if entry is None:
+        raise FileNotFoundError(icon_path)
+    return entry
+
+
+# Icons are extracted off the enumeration path; buttons show a placeholder until icon_ready
+icon_service = IconService(
+    extract_func=lambda exe_path, hwnd: _get_window_icon(exe_path, hwnd),
+    on_extracted=_store_extracted_icon,
+    worker_init=_init_icon_worker,
+    worker_exit=_exit_icon_worker,
+    max_workers=2
+)
+icon_service.start()
+
+# Icons are validated on first use and repaired off the GUI thread
+icon_validator = IconPathValidator(on_invalid=_schedule_icon_reextraction, ttl=CONFIG.INTERNAL_ICON_STAT_TTL / 1000,
+                                   stat_func=_stat_icon_path)
+app_info_updated_callback: Optional[Callable[[str], None]] = None
 
 
 def add_hwnd_to_exclude(widget: QWidget):
@@ -126,120 +298,88 @@ def add_hwnd_to_exclude(widget: QWidget):
     global hwnds_to_exclude
 
     hwnd = int(widget.winId())  # Convert the voidptr to an integer
-    hwnds_to_exclude.append(hwnd)
+    hwnds_to_exclude.add(hwnd)
+
+
+def get_filtered_list_of_windows(this_window: Optional[QWidget] = None) -> Mapping[int, WindowInfo]:
+    """Enumerate the open windows, update the WindowManager and return its current, read-only mapping."""
+    scan_windows(this_window)
+    return manager.get_open_windows_info()
 
 
-def get_filtered_list_of_windows(this_window: Optional[QWidget] = None) -> WindowMapping:
-    temp_window_hwnds_mapping: WindowMapping = {}
+def scan_windows(this_window: Optional[QWidget] = None) -> WindowDiff:
+    """Enumerate the open windows and apply them to the WindowManager, returning what changed."""
+    scanned: Dict[int, Tuple[str, str]] = {}
     this_program_hwnd = int(this_window.winId()) if this_window else 0
 
-    def enum_windows_callback(hwnd: int, _lparam: Any) -> None:
-        if not win32gui.IsWindowVisible(hwnd):
-            return
+    try:
+        # One pass over all top-level windows; only survivors of the cheap checks reach the process lookup
+        if this_program_hwnd:
+            hwnds_to_exclude.add(this_program_hwnd)
+        with enumeration_lock:
+            batch = collect_windows(enum_backend, window_batch, window_filter)
+            accepted = [(hwnd, title) for hwnd, _, title in batch]
+        for hwnd, title in accepted:
+            entry = _build_window_entry(hwnd, title)
+            if entry:
+                for entry_hwnd, (clean_title, exe_name, _) in entry.items():
+                    scanned[entry_hwnd] = (clean_title, exe_name)
+    except Exception as e:
+        logger.error(f"Error getting windows: {e}")
+        return WindowDiff()
 
-        window_title = win32gui.GetWindowText(hwnd)
-        class_name = win32gui.GetClassName(hwnd)
+    # Drop cached processes that have exited since the last scan
+    process_resolver.sweep()
+    logger.debug(f"Process resolver: {process_resolver.stats()}, title normalizer: {title_normalizer.stats()}, "
+                 f"app names: {app_name_resolver.stats()}, icons: {icon_service.stats()}")
+    if window_filter.profile:
+        logger.debug(f"Window filter rules: {window_filter.stats()}")
 
-        # Check window cloaked state
-        is_cloaked = ctypes.c_int(0)
-        ctypes.WinDLL("dwmapi").DwmGetWindowAttribute(
-            hwnd, DWM_WINDOW_CLOAKED_STATE, ctypes.byref(is_cloaked), ctypes.sizeof(is_cloaked)
-        )
+    # Keeps the last-seen timestamps current, which the cache eviction is based on
+    app_info_store.touch({exe_name for _, exe_name in scanned.values()})
 
-        if _should_include_window(hwnd, window_title, class_name, is_cloaked.value, this_program_hwnd):
-            entry, app_name = _get_window_info(hwnd)
-            _clean_window_titles(temp_window_hwnds_mapping, entry, app_name)
+    # Instance numbers are kept by the snapshot store across refreshes
+    diff = manager.apply_window_scan(scanned)
+    # Keeps the recency order current even when window events are disabled
+    manager.activate_window(win32gui.GetForegroundWindow())
+    return diff
 
-    # Enumerate all top-level windows and pass each main_window's handle to the callback
-    try:
-        win32gui.EnumWindows(enum_windows_callback, None)
-        # Assign instance numbers if windows have the same title
-        temp_window_hwnds_mapping = assign_instance_numbers(temp_window_hwnds_mapping)
 
-        # Update the main mapping dictionary with the filtered main_window handles
-        manager.update_open_windows_info(temp_window_hwnds_mapping)
+def get_window_entry(hwnd: int, this_program_hwnd: int = 0) -> Optional[Tuple[str, str]]:
+    """Return (title, exe_name) for a single top-level window, or None if it should not be listed.
 
-        return manager.get_open_windows_info()
-    except Exception as e:
-        logger.error(f"Error getting windows: {e}")
-        return {}
-
-
-def _should_include_window(
-        hwnd: int,
-        window_title: str,
-        class_name: str,
-        is_cloaked: int,
-        this_program_hwnd: int
-) -> bool:
-    """Check if a window should be included in the filtered list."""
-    return all([
-        win32gui.IsWindowVisible(hwnd),
-        is_cloaked == 0,
-        window_title.strip(),
-        class_name not in EXCLUDED_CLASS_NAMES,
-        hwnd != this_program_hwnd,
-        hwnd not in hwnds_to_exclude
-    ])
-
-
-def _clean_window_titles(mapping: WindowMapping, entry: WindowMapping, app_name: str) -> None:
-    """Update window titles in the mapping, removing unnecessary suffixes."""
-    for hwnd, (window_title, exe_name, _) in entry.items():
-        clean_title = window_title
-        if exe_name == "explorer.exe" and " - File Explorer" in window_title:
-            clean_title = window_title.replace(" - File Explorer", "")
-        elif f" - {app_name}" in window_title:
-            clean_title = window_title.replace(f" - {app_name}", "")
-
-        mapping[hwnd] = (clean_title, exe_name, 0)
-
-
-def assign_instance_numbers(temp_window_hwnds_mapping: Dict[int, Tuple[str, str, int]]) -> Dict[int, Tuple[str, str, int]]:
-    """Assign unique instance numbers to windows with the same title and executable name."""
-
-    # Get the current mapping of HWNDs to window info from the manager
-    existing_mapping = manager.get_open_windows_info()
-
-    # Create our result mapping
-    result_mapping = {}
-
-    # Track used instance numbers for each title/exe pair
-    title_exe_mapping: Dict[Tuple[str, str], set] = {}
-
-    # First step: Register all instances from the manager
-    for hwnd, (title, exe, instance) in existing_mapping.items():
-        key = (title, exe)
-        if key not in title_exe_mapping:
-            title_exe_mapping[key] = set()
-        title_exe_mapping[key].add(instance)
-
-    # Second step: Process each window
-    for hwnd, (title, exe, instance) in temp_window_hwnds_mapping.items():
-        # If window exists in manager, update its title and exe but keep the instance number
-        if hwnd in existing_mapping:
-            old_title, _, instance = existing_mapping[hwnd]  # Preserve the existing instance number
-            new_title, _, _ = temp_window_hwnds_mapping[hwnd]  # Get the updated title and exe
-            if new_title != old_title:
-                instance = 0
-            else:
-                result_mapping[hwnd] = (new_title, exe, instance)
-                continue
+    This is the per-window counterpart of scan_windows, used for event-driven updates.
+    """
+    try:
+        if not win32gui.IsWindow(hwnd) or win32gui.GetAncestor(hwnd, win32con.GA_PARENT) != win32gui.GetDesktopWindow():
+            return None
 
-        key = (title, exe)
-        if key not in title_exe_mapping:
-            title_exe_mapping[key] = set()
+        if this_program_hwnd:
+            hwnds_to_exclude.add(this_program_hwnd)
+        with enumeration_lock:
+            result = window_filter.evaluate(enum_backend, hwnd)
+        if result is None:
+            return None
 
-        # Always try to find the next available instance number
-        new_instance = 0
-        while new_instance in title_exe_mapping[key]:
-            new_instance += 1
+        entry = _build_window_entry(hwnd, result[1])
+        if not entry or hwnd not in entry:
+            return None
+        title, exe_name, _ = entry[hwnd]
+        return title, exe_name
+    except Exception as e:
+        logger.debug(f"Could not resolve window {hwnd}: {e}")
+        return None
 
-        # Add the new instance to our tracking set
-        title_exe_mapping[key].add(new_instance)
-        result_mapping[hwnd] = (title, exe, new_instance)
 
-    return result_mapping
+def _build_window_entry(hwnd: int, window_title: str) -> Optional[WindowMapping]:
+    """Resolve the process of a filtered window and return the cleaned {hwnd: (title, exe_name, 0)} entry."""
+    entry, app_name = _get_window_info(hwnd, window_title)
+    mapping: WindowMapping = {}
+    for entry_hwnd, (title, exe_name, _) in entry.items():
+        if app_name:
+            title_normalizer.set_app_name(exe_name, app_name)
+        mapping[entry_hwnd] = (title_normalizer.normalize(exe_name, title), exe_name, 0)
+    return mapping
 
 
 def _get_pid_from_window_handle(hwnd):
@@ -252,47 +392,45 @@ def _get_pid_from_window_handle(hwnd):
         return None
 
 
-def _get_window_info(window_handle):
+def _get_window_info(window_handle, window_title: Optional[str] = None):
     """Retrieve the application name, window title, exe_name, and default instance number 0 for a given main_window handle.
 
     Args:
         window_handle (any): The handle of the main_window for which to retrieve application info.
+        window_title: The already known title, to avoid reading it again.
 
     Returns:
-        dict: A dictionary where the key is the window_handle (int) and the value is a tuple (window_title, exe_name, 0).
+        tuple: A dictionary mapping the window_handle (int) to (window_title, exe_name, 0), and the app name,
+        which is None if the process could not be resolved.
     """
     result = {}
-    window_title = _get_window_title(window_handle)
+    if window_title is None:
+        window_title = _get_window_title(window_handle)
 
     if window_handle:
         pid = _get_pid_from_window_handle(window_handle)
         if pid:
-            try:
-                process = psutil.Process(pid)
-                exe_path = process.exe()
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess) as e:
-                logger.error(f"Error accessing executable for PID {pid}: {e}")
-                result[window_handle] = (window_title, "Unknown App", 0)
-                return result
-
-            if os.path.exists(exe_path):
-                exe_name = os.path.basename(exe_path).lower()
-
-                if exe_name in app_cache:
-                    app_name = app_cache[exe_name]["app_name"]
-                else:
-                    app_name = _get_friendly_app_name(exe_path, exe_name)
-                    app_cache[exe_name] = {"app_name": app_name, "icon_path": _get_window_icon(exe_path, window_handle),
-                                           "exe_path": exe_path}
-                    save_cache(app_cache)
+            # Cached for the lifetime of the process, so steady-state refreshes make no process queries
+            process_info = process_resolver.resolve(pid)
+            if process_info is not None:
+                exe_path, exe_name = process_info.exe_path, process_info.exe_name
+
+                app_name = app_info_store.snapshot().get(exe_name, "app_name", None)
+                if app_name is None:
+                    app_name = process_info.friendly_name
+                    app_info_store.upsert(exe_name, app_name=app_name, exe_path=exe_path)
+                    icon_service.request(exe_name, exe_path, window_handle)
+                    # The lookup may have finished before the record existed, in which case it was not applied
+                    resolved_name = app_name_resolver.peek(exe_path)
+                    if resolved_name and resolved_name != app_name:
+                        app_info_store.update(exe_name, app_name=resolved_name)
+                        app_name = resolved_name
 
                 result[window_handle] = (window_title, exe_name, 0)
                 return result, app_name
-            else:
-                logger.warning(f"Executable path does not exist: {exe_path}")
         result[window_handle] = (window_title, "Unknown App", 0)
 
-    return result
+    return result, None
 
 
 def _get_friendly_app_name(exe_path: str, exe_name: str):
@@ -307,72 +445,60 @@ def _get_friendly_app_name(exe_path: str, exe_name: str):
             "FileDescription",
         )
         friendly_name = win32api.GetFileVersionInfo(exe_path, string_file_info)
-        if friendly_name.strip() and not "Unknown App":
-            return friendly_name
+        if friendly_name and friendly_name.strip():
+            return friendly_name.strip()
         else:
-            return os.path.splitext(exe_name)[0].capitalize()  # Remove the ".exe" extension
+            return placeholder_app_name(exe_name)
     except Exception as e:
         logger.error(f"Error retrieving file description for {exe_path}: {e}")
-        return os.path.splitext(exe_name)[0].capitalize()  # Remove the ".exe" extension
-
-
-def hicon_to_image(icon_handle: int, size: tuple[int, int] = (32, 32)) -> Image.Image:
-    """Converts an HICON to a PIL Image."""
-    # Get a device context for the screen.
-    screen_dc = win32gui.GetDC(0)
-    device_context = win32ui.CreateDCFromHandle(screen_dc)
-    memory_dc = device_context.CreateCompatibleDC()
-    bitmap = win32ui.CreateBitmap()
-    bitmap.CreateCompatibleBitmap(device_context, size[0], size[1])
-    memory_dc.SelectObject(bitmap)
-
-    # Draw the icon into the memory DC.
-    win32gui.DrawIconEx(memory_dc.GetSafeHdc(), 0, 0, icon_handle, size[0], size[1], 0, None, win32con.DI_NORMAL)
+        return placeholder_app_name(exe_name)
 
-    bitmap_info = bitmap.GetInfo()
-    bitmap_bits = bitmap.GetBitmapBits(True)
 
-    image = Image.frombuffer('RGBA', (bitmap_info['bmWidth'], bitmap_info['bmHeight']),
-                             bitmap_bits, 'raw', 'BGRA', 0, 1)
+def _icon_renderer() -> HiconRenderer:
+    """The calling thread's icon renderer, so the DC and bitmap are reused for all its extractions."""
+    renderer = getattr(_icon_renderers, "renderer", None)
+    if renderer is None:
+        renderer = HiconRenderer(max(CONFIG.INTERNAL_ICON_SIZES))
+        _icon_renderers.renderer = renderer
+    return renderer
 
-    # Clean up resources.
-    try:
-        memory_dc.DeleteDC()
-        device_context.DeleteDC()
-        win32gui.ReleaseDC(0, screen_dc)
-        win32gui.DestroyIcon(icon_handle)
-    except Exception as e:
-        logger.error(f"Error during cleanup in hicon_to_image: {e}")
 
-    return image
+def _close_icon_renderer() -> None:
+    renderer = getattr(_icon_renderers, "renderer", None)
+    if renderer is not None:
+        renderer.close()
+        _icon_renderers.renderer = None
 
 
 def _get_window_icon(exe_path: str, hwnd: int) -> Optional[str]:
-    """Gets the icon for an open window using exe_path first, then WM_GETICON as fallback."""
+    """Gets the icon for an open window using exe_path first, then WM_GETICON as fallback.
+
+    The icon is stored in the icon atlas under the exe name and its "atlas:<exe_name>" path is returned.
+    """
     try:
-        pythoncom.CoInitialize()
-        icon_folder = "app_icons"
-        if not os.path.exists(icon_folder):
-            os.makedirs(icon_folder)
+        # Runs on an icon worker, which already initialized COM
+        exe_name = os.path.basename(exe_path).lower()
+        if not exe_name:
+            logger.warning(f"_get_window_icon: no exe_path for hwnd {hwnd}")
+            return None
 
-        # Try using exe_path method first
-        if exe_path and os.path.exists(exe_path):
+        # Try using exe_path method first, rendering the exe's own image for every size
+        if os.path.exists(exe_path):
             try:
-                large, small = win32gui.ExtractIconEx(exe_path, 0)
-                if large or small:
-                    icon_handle = large[0] if large else small[0]
-                    image = hicon_to_image(icon_handle, size=(32, 32))
-                    exe_name = os.path.basename(exe_path)
-                    icon_filename = os.path.splitext(exe_name)[0] + '.png'
-                    icon_path = os.path.join(icon_folder, icon_filename)
-                    image.save(icon_path, format='PNG')
-                    return icon_path
+                renderer = _icon_renderer()
+                images = {}
+                for size in CONFIG.INTERNAL_ICON_SIZES:
+                    icon_handle = _extract_icon_handle(exe_path, size)
+                    if icon_handle:
+                        images[size] = renderer.render_png(icon_handle, size)
+                if any(images.values()):
+                    return _store_icon_images(exe_name, images)
                 else:
                     logger.warning(f"No icon found in exe_path: {exe_path}")
             except Exception as e:
                 logger.error(f"Error extracting icon from exe_path: {e}")
         else:
-            logger.warning(f"_get_window_icon: exe_path not provided or doesn't exist for hwnd {hwnd}")
+            logger.warning(f"_get_window_icon: exe_path doesn't exist for hwnd {hwnd}")
 
         # Fallback: try using WM_GETICON method.
         logger.info(f"Falling back to WM_GETICON method for hwnd {hwnd}")
@@ -389,12 +515,12 @@ def _get_window_icon(exe_path: str, hwnd: int) -> Optional[str]:
             logger.warning(f"No icon found using WM_GETICON method for hwnd {hwnd}")
             return None
 
-        image = hicon_to_image(icon_handle, size=(32, 32))
-        exe_name = os.path.basename(exe_path)  # Get exe_name for fallback case
-        exe_name_no_ext = os.path.splitext(exe_name)[0]  # Remove .exe extension
-        icon_path = os.path.join(icon_folder, f"{exe_name_no_ext}.png")  # Use exe_name without extension
-        image.save(icon_path, format="PNG")
-        logger.debug(f"Icon extracted using WM_GETICON method saved as {icon_path}")
+        # The window's icon is at most 32px; it belongs to the window, so it is not destroyed
+        renderer = _icon_renderer()
+        images = {size: renderer.render_png(icon_handle, size, destroy_icon=False)
+                  for size in CONFIG.INTERNAL_ICON_SIZES if size <= 32}
+        icon_path = _store_icon_images(exe_name, images)
+        logger.debug(f"Icon extracted using WM_GETICON method stored as {icon_path}")
         return icon_path
 
     except Exception as e:
@@ -402,6 +528,21 @@ def _get_window_icon(exe_path: str, hwnd: int) -> Optional[str]:
         return None
 
 
+def _extract_icon_handle(exe_path: str, size: int) -> int:
+    """Extract the first icon of an executable at the given size, or 0. The caller destroys the handle."""
+    icon_handle = wintypes.HICON()
+    icon_id = wintypes.UINT()
+    count = windll.user32.PrivateExtractIconsW(exe_path, 0, size, size, ctypes.byref(icon_handle),
+                                               ctypes.byref(icon_id), 1, 0)
+    return (icon_handle.value or 0) if count == 1 else 0
+
+
+def _store_icon_images(exe_name: str, images: Dict[int, Optional[bytes]]) -> str:
+    """Store the PNG-encoded icon sizes in the icon atlas and return the atlas path of the icon."""
+    icon_atlas.set_icon(exe_name, {size: data for size, data in images.items() if data})
+    return atlas_icon_path(exe_name)
+
+
 def _get_window_title(hwnd):
     """Retrieve the title of the main_window for a given main_window handle."""
     try:
@@ -0,0 +1,67 @@
+from src.utils.process_resolver import ProcessResolver
+
+
+class FakeProcessBackend:
+    """pid -> (create_time, exe_path); exe_path None means the process cannot be queried."""
+
+    def __init__(self):
+        self.processes = {}
+        self.opened = 0
+
+    def open(self, pid):
+        self.opened += 1
+        process = self.processes.get(pid)
+        if process is None or process[1] is None:
+            return None
+        return pid, process[0], process[1]
+
+    def get_create_time(self, pid):
+        process = self.processes.get(pid)
+        return process[0] if process is not None else None
+
+    def has_exited(self, handle):
+        return handle not in self.processes
+
+    def close(self, handle):
+        pass
+
+
+def make_resolver():
+    backend = FakeProcessBackend()
+    return ProcessResolver(lambda exe_path, exe_name: exe_name, backend=backend), backend
+
+
+def test_unresolvable_pid_is_not_queried_again():
+    resolver, backend = make_resolver()
+    backend.processes[10] = (1, None)
+
+    assert resolver.resolve(10) is None
+    assert resolver.resolve(10) is None
+    assert backend.opened == 1
+    assert resolver.stats()["failures"] == 1
+
+
+def test_reused_pid_of_unresolvable_process_is_resolved():
+    resolver, backend = make_resolver()
+    backend.processes[10] = (1, None)
+    assert resolver.resolve(10) is None
+
+    # The process exited and its PID went to a new process
+    backend.processes[10] = (2, __file__)
+    info = resolver.resolve(10)
+
+    assert info is not None
+    assert info.key == (10, 2)
+    assert info.exe_name == "test_process_resolver.py"
+
+
+def test_sweep_forgets_unresolvable_pids_not_seen():
+    resolver, backend = make_resolver()
+    backend.processes[10] = (1, None)
+    resolver.resolve(10)
+
+    resolver.sweep()
+    resolver.sweep()
+    resolver.resolve(10)
+
+    assert backend.opened == 2
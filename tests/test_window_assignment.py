@@ -0,0 +1,170 @@
+import random
+
+import pytest
+
+from src.data.config import CONFIG
+from src.data.window_assignment import (WindowAssignmentEngine, ButtonSlot, SLOT_ANY_WINDOW, SLOT_PROGRAM_WINDOW,
+                                        NO_WINDOW_ANY, NO_WINDOW_PROGRAM)
+from src.data.window_manager import WindowManager
+
+SEEDS = range(200)
+
+
+def random_case(seed: int):
+    """Random buttons, windows and MRU order, including closed and duplicate previous assignments."""
+    rng = random.Random(seed)
+    exes = [f"app{i}.exe" for i in range(rng.randint(1, 8))]
+    windows = {0x1000 + i * 4: (f"Window {i}", rng.choice(exes), 0) for i in range(rng.randint(0, 60))}
+    hwnds = list(windows)
+    closed = [0x9000 + i for i in range(5)]
+    recency = rng.sample(hwnds + closed, rng.randint(0, len(hwnds) + len(closed)))
+    slots = []
+    for button_id in range(rng.randint(1, 48)):
+        previous = rng.choice(hwnds + closed + [-1, 0]) if hwnds else rng.choice(closed + [-1, 0])
+        if rng.random() < 0.3:
+            slots.append(ButtonSlot(button_id, SLOT_PROGRAM_WINDOW, previous, rng.choice(exes + ["missing.exe"]),
+                                    pinned=rng.random() < 0.3))
+        else:
+            slots.append(ButtonSlot(button_id, SLOT_ANY_WINDOW, previous, pinned=rng.random() < 0.3))
+    return slots, windows, recency, rng.random() < 0.5
+
+
+def keeps_window(slot: ButtonSlot, windows, reassign_all: bool) -> bool:
+    """Whether the slot is entitled to keep its previous window."""
+    if slot.hwnd not in windows or (reassign_all and not slot.pinned):
+        return False
+    return slot.kind == SLOT_ANY_WINDOW or windows[slot.hwnd][1] == slot.exe_name
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_assignment_is_deterministic(seed):
+    slots, windows, recency, reassign_all = random_case(seed)
+    result = WindowAssignmentEngine().assign(slots, windows, recency, reassign_all)
+
+    shuffled_slots = list(slots)
+    random.Random(seed).shuffle(shuffled_slots)
+    shuffled_windows = dict(reversed(list(windows.items())))
+
+    assert WindowAssignmentEngine().assign(shuffled_slots, shuffled_windows, recency, reassign_all) == result
+    assert WindowAssignmentEngine().assign(slots, windows, recency, reassign_all) == result
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_every_button_gets_a_unique_open_window_or_none(seed):
+    slots, windows, recency, reassign_all = random_case(seed)
+    result = WindowAssignmentEngine().assign(slots, windows, recency, reassign_all)
+
+    assert set(result) == {slot.button_id for slot in slots}
+    assigned = [hwnd for hwnd in result.values() if hwnd not in (NO_WINDOW_ANY, NO_WINDOW_PROGRAM)]
+    assert len(assigned) == len(set(assigned))
+    assert all(hwnd in windows for hwnd in assigned)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_program_buttons_only_get_windows_of_their_exe(seed):
+    slots, windows, recency, reassign_all = random_case(seed)
+    result = WindowAssignmentEngine().assign(slots, windows, recency, reassign_all)
+
+    for slot in slots:
+        hwnd = result[slot.button_id]
+        if slot.kind != SLOT_PROGRAM_WINDOW:
+            continue
+        if hwnd == NO_WINDOW_PROGRAM:
+            # Only if every window of the exe went to another button
+            owned = {result[other.button_id] for other in slots}
+            assert all(h in owned for h, info in windows.items() if info[1] == slot.exe_name)
+        else:
+            assert windows[hwnd][1] == slot.exe_name
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_kept_assignments_are_stable_across_scans(seed):
+    slots, windows, recency, reassign_all = random_case(seed)
+    engine = WindowAssignmentEngine()
+    result = engine.assign(slots, windows, recency, reassign_all)
+
+    # Previous windows are kept, the lowest button ID wins if two buttons claim the same one
+    claimed = set()
+    for slot in sorted(slots, key=lambda s: s.button_id):
+        if keeps_window(slot, windows, reassign_all) and slot.hwnd not in claimed:
+            claimed.add(slot.hwnd)
+            assert result[slot.button_id] == slot.hwnd
+
+    # The next scan with the same windows, even in a different MRU order, changes nothing
+    rescanned = [ButtonSlot(s.button_id, s.kind, result[s.button_id], s.exe_name, s.pinned) for s in slots]
+    assert engine.assign(rescanned, windows, list(reversed(recency))) == result
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_free_windows_fill_any_window_buttons_in_order(seed):
+    slots, windows, recency, reassign_all = random_case(seed)
+    result = WindowAssignmentEngine().assign(slots, windows, recency, reassign_all)
+
+    any_ids = sorted(slot.button_id for slot in slots if slot.kind == SLOT_ANY_WINDOW)
+    empty = [button_id for button_id in any_ids if result[button_id] == NO_WINDOW_ANY]
+    if empty:
+        assert set(windows) <= set(result.values())
+        # Gaps are filled lowest ID first: no empty button before a newly filled one
+        kept = {s.button_id for s in slots if result[s.button_id] == s.hwnd}
+        newly_filled = [button_id for button_id in any_ids if button_id not in kept
+                        and result[button_id] != NO_WINDOW_ANY]
+        assert not newly_filled or max(newly_filled) < min(empty)
+
+
+def test_gaps_are_filled_most_recently_used_first():
+    windows = {10: ("a", "a.exe", 0), 20: ("b", "b.exe", 0), 30: ("c", "c.exe", 0), 40: ("d", "d.exe", 0)}
+    slots = [ButtonSlot(i, SLOT_ANY_WINDOW, -1) for i in range(4)]
+
+    result = WindowAssignmentEngine().assign(slots, windows, recency=[30, 10])
+
+    # MRU windows first, then unknown windows by hwnd
+    assert result == {0: 30, 1: 10, 2: 20, 3: 40}
+
+
+class FakeButtonInfo:
+    def __init__(self, buttons):
+        self.buttons = buttons
+
+    def get_all_tasks(self):
+        return self.buttons
+
+
+class FakePieWindow:
+    def __init__(self):
+        self.emitted = {}
+        self.update_buttons_signal = self
+
+    def emit(self, changed_buttons):
+        self.emitted.update(changed_buttons)
+
+
+@pytest.fixture
+def manager():
+    WindowManager._instance = None
+    yield WindowManager.get_instance()
+    WindowManager._instance = None
+
+
+def any_window_button(hwnd: int):
+    return {"task_type": "show_any_window",
+            "properties": {"window_handle": hwnd, "window_title": "", "app_name": "", "app_icon_path": "",
+                           "exe_name": ""}}
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_pinned_buttons_keep_their_window_on_reassign_all(manager, seed):
+    rng = random.Random(seed)
+    num_buttons = CONFIG.REASSIGN_BTN_IDS_HIGHER_THAN + 10
+    manager.apply_window_scan({0x1000 + i: (f"Window {i}", f"app{i % 3}.exe") for i in range(num_buttons)})
+    hwnds = list(manager.get_open_windows_info())
+    rng.shuffle(hwnds)
+    button_info = FakeButtonInfo({button_id: any_window_button(hwnds[button_id]) for button_id in range(num_buttons)})
+    pie_window = FakePieWindow()
+
+    manager.update_button_window_assignment(pie_window, button_info, reassign_all_buttons=True)
+
+    assigned = {button_id: button["properties"]["window_handle"] for button_id, button in pie_window.emitted.items()}
+    for button_id in range(num_buttons):
+        if button_id <= CONFIG.REASSIGN_BTN_IDS_HIGHER_THAN:
+            assert assigned[button_id] == hwnds[button_id]
+    assert len(set(assigned.values())) == num_buttons
@@ -0,0 +1,188 @@
+import pytest
+
+from src.data.window_manager import WindowManager
+from src.data.window_snapshot_store import WindowSnapshotStore, WindowDelta
+from src.helper.window_event_source import ScriptedWindowEventSource, WindowEventTracker, WindowEventKind, WindowEvent
+
+
+@pytest.fixture
+def manager():
+    WindowManager._instance = None
+    yield WindowManager.get_instance()
+    WindowManager._instance = None
+
+
+class FakeDesktop:
+    """The windows a resolve_window function would find: hwnd -> (title, exe_name), None if not listable."""
+
+    def __init__(self):
+        self.windows = {}
+
+    def resolve(self, hwnd):
+        return self.windows.get(hwnd)
+
+
+@pytest.fixture
+def desktop():
+    return FakeDesktop()
+
+
+@pytest.fixture
+def tracked(manager, desktop):
+    """A started tracker on a scripted source; returns (source, changes), changes counts on_change calls."""
+    source = ScriptedWindowEventSource()
+    changes = []
+    tracker = WindowEventTracker(source, desktop.resolve, manager, on_change=lambda: changes.append(1))
+    tracker.start()
+    yield source, changes
+    tracker.stop()
+
+
+def test_created_window_is_added(manager, desktop, tracked):
+    source, changes = tracked
+    desktop.windows[1] = ("Doc", "word.exe")
+    source.push(WindowEventKind.CREATED, 1)
+
+    assert source.play() == 1
+    assert manager.last_diff.added == {1: ("Doc", "word.exe", 0)}
+    assert manager.get_snapshot().windows == {1: ("Doc", "word.exe", 0)}
+    assert 1 in manager.get_snapshot()
+    assert changes == [1]
+
+
+def test_destroyed_window_is_removed(manager, desktop, tracked):
+    source, changes = tracked
+    desktop.windows[1] = ("Doc", "word.exe")
+    source.push(WindowEventKind.CREATED, 1)
+    source.play()
+    generation = manager.get_snapshot().generation
+
+    del desktop.windows[1]
+    source.push(WindowEventKind.DESTROYED, 1)
+    source.play()
+
+    assert manager.last_diff.removed == {1: ("Doc", "word.exe", 0)}
+    assert 1 not in manager.get_snapshot()
+    assert manager.get_snapshot().generation == generation + 1
+    assert changes == [1, 1]
+
+
+@pytest.mark.parametrize("kind", [WindowEventKind.HIDDEN, WindowEventKind.CLOAKED])
+def test_hidden_or_cloaked_window_is_removed_and_comes_back(manager, desktop, tracked, kind):
+    source, _ = tracked
+    desktop.windows[1] = ("Doc", "word.exe")
+    source.push(WindowEventKind.SHOWN, 1)
+    source.push(kind, 1)
+    source.play()
+    assert 1 not in manager.get_snapshot()
+
+    source.push(WindowEventKind.UNCLOAKED if kind is WindowEventKind.CLOAKED else WindowEventKind.SHOWN, 1)
+    source.play()
+    assert manager.get_window_info(1) == ("Doc", "word.exe", 0)
+
+
+def test_name_change_retitles_window(manager, desktop, tracked):
+    source, _ = tracked
+    desktop.windows[1] = ("Doc", "word.exe")
+    source.push(WindowEventKind.CREATED, 1)
+    source.play()
+
+    desktop.windows[1] = ("Report", "word.exe")
+    source.push(WindowEventKind.RENAMED, 1)
+    source.play()
+
+    assert manager.last_diff.retitled == {1: ("Report", "word.exe", 0)}
+    assert manager.get_window_info(1) == ("Report", "word.exe", 0)
+
+
+def test_name_change_to_unlistable_removes_window(manager, desktop, tracked):
+    source, _ = tracked
+    desktop.windows[1] = ("Doc", "word.exe")
+    source.push(WindowEventKind.CREATED, 1)
+    source.play()
+
+    desktop.windows[1] = None  # e.g. the title became empty
+    source.push(WindowEventKind.RENAMED, 1)
+    source.play()
+
+    assert 1 not in manager.get_snapshot()
+
+
+def test_events_without_changes_do_not_publish(manager, desktop, tracked):
+    source, changes = tracked
+    desktop.windows[1] = ("Doc", "word.exe")
+    source.push(WindowEventKind.CREATED, 1)
+    source.push(WindowEventKind.SHOWN, 1)  # Already listed with the same title
+    source.push(WindowEventKind.RENAMED, 1)
+    source.push(WindowEventKind.DESTROYED, 2)  # Never listed
+    source.push(WindowEventKind.CREATED, 3)  # Not listable
+    source.play()
+
+    assert changes == [1]
+    assert manager.get_snapshot().generation == 1
+
+
+def test_foreground_only_updates_recency(manager, desktop, tracked):
+    source, changes = tracked
+    desktop.windows.update({1: ("A", "a.exe"), 2: ("B", "b.exe")})
+    source.push(WindowEventKind.CREATED, 1)
+    source.push(WindowEventKind.CREATED, 2)
+    source.play()
+    generation = manager.get_snapshot().generation
+
+    source.push(WindowEventKind.FOREGROUND, 2)
+    source.play()
+
+    assert manager.get_windows_by_recency() == [2, 1]
+    assert manager.get_snapshot().generation == generation
+    assert len(changes) == 2
+
+
+def test_compute_delta(manager, desktop):
+    tracker = WindowEventTracker(ScriptedWindowEventSource(), desktop.resolve, manager)
+    manager.apply_window_scan({1: ("Doc", "word.exe")})
+    desktop.windows.update({1: ("Report", "word.exe"), 2: ("Tab", "chrome.exe")})
+
+    assert tracker.compute_delta(WindowEvent(WindowEventKind.CREATED, 2)) == WindowDelta(added={2: ("Tab", "chrome.exe")})
+    assert tracker.compute_delta(WindowEvent(WindowEventKind.RENAMED, 1)) == WindowDelta(retitled={1: ("Report", "word.exe")})
+    assert tracker.compute_delta(WindowEvent(WindowEventKind.DESTROYED, 1)) == WindowDelta(removed={1})
+    assert tracker.compute_delta(WindowEvent(WindowEventKind.DESTROYED, 2)).is_empty()
+
+
+def test_unstarted_source_delivers_nothing(manager, desktop):
+    source = ScriptedWindowEventSource([(WindowEventKind.CREATED, 1)])
+    assert source.play() == 0
+
+
+def test_apply_delta_numbers_instances_per_title_and_exe():
+    store = WindowSnapshotStore()
+    diff = store.apply_delta(WindowDelta(added={1: ("Doc", "word.exe"), 2: ("Doc", "word.exe"),
+                                                3: ("Doc", "notepad.exe")}))
+    assert diff.added == {1: ("Doc", "word.exe", 0), 2: ("Doc", "word.exe", 1), 3: ("Doc", "notepad.exe", 0)}
+
+    # A closed window's instance number is reused by the next window with the same title
+    store.apply_delta(WindowDelta(removed={1}))
+    diff = store.apply_delta(WindowDelta(added={4: ("Doc", "word.exe")}))
+    assert diff.added == {4: ("Doc", "word.exe", 0)}
+
+    # Retitling releases the old number and allocates one for the new title
+    diff = store.apply_delta(WindowDelta(retitled={2: ("Doc", "notepad.exe")}))
+    assert diff.retitled == {2: ("Doc", "notepad.exe", 1)}
+    diff = store.apply_delta(WindowDelta(added={5: ("Doc", "word.exe")}))
+    assert diff.added == {5: ("Doc", "word.exe", 1)}
+
+    snapshot = store.snapshot()
+    assert dict(snapshot.windows) == {2: ("Doc", "notepad.exe", 1), 3: ("Doc", "notepad.exe", 0),
+                                      4: ("Doc", "word.exe", 0), 5: ("Doc", "word.exe", 1)}
+    assert snapshot.generation == 5  # One per non-empty delta
+
+
+def test_apply_delta_counts_unchanged_and_skips_empty():
+    store = WindowSnapshotStore()
+    store.apply_delta(WindowDelta(added={1: ("A", "a.exe"), 2: ("B", "b.exe")}))
+
+    diff = store.apply_delta(WindowDelta(added={1: ("A", "a.exe")}))
+
+    assert diff.is_empty()
+    assert diff.unchanged == 2
+    assert store.generation == 1